@@ -45,8 +45,9 @@ def add_sharepoint_documents():
     # Delete old SharePoint documents (they're bad quality)
     if sharepoint_count > 0:
         print(f"\n[*] Deleting {sharepoint_count} old SharePoint documents...")
-        result = collection.delete_many({"metadata.source": "cloudfuze_doc360"})
-        print(f"[OK] Deleted {result.deleted_count} documents")
+        from app.vectorstore import delete_app_vectors
+        deleted_count = delete_app_vectors(vectorstore, {"metadata.source": "cloudfuze_doc360"})
+        print(f"[OK] Deleted {deleted_count} documents")
     
     # Extract SharePoint documents again
     print("\n[*] Extracting SharePoint documents...")
@@ -1,6 +1,6 @@
 import os
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional, Set
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 
@@ -79,8 +79,12 @@ def extract_text_from_docx(docx_path: str) -> str:
         print(f"Error reading Word document {docx_path}: {e}")
         return ""
 
-def process_doc_directory(doc_directory: str) -> List[Document]:
-    """Process all Word documents in a directory and return as LangChain Documents."""
+def process_doc_directory(doc_directory: str, only_files: Optional[Set[str]] = None) -> List[Document]:
+    """Process all Word documents in a directory and return as LangChain Documents.
+    
+    If only_files is given, only files whose names are in it are processed
+    (used by incremental rebuilds to skip unchanged files).
+    """
     documents = []
     
     if not os.path.exists(doc_directory):
@@ -95,6 +99,9 @@ def process_doc_directory(doc_directory: str) -> List[Document]:
         if any(file.lower().endswith(ext) for ext in doc_extensions):
             doc_files.append(file)
     
+    if only_files is not None:
+        doc_files = [f for f in doc_files if f in only_files]
+    
     if not doc_files:
         print(f"No Word documents found in {doc_directory}")
         return documents
@@ -118,9 +125,9 @@ def process_doc_directory(doc_directory: str) -> List[Document]:
                         "source": doc_file,
                         "source_type": source_type,
                         "file_path": doc_path,
-                        "file_format": doc_file.split('.')[-1].lower(),
+                        "file_format": doc_file.rpartition('.')[2].lower(),
                         "content_type": "word_document",
-                        "searchable_terms": " ".join(text.split()[:20])  # Add first 20 words for better searchability
+                        "searchable_terms": " ".join(text.split(None, 20)[:20])  # Add first 20 words for better searchability
                     }
                 )
                 documents.append(doc)
@@ -152,7 +159,7 @@ def chunk_doc_documents(documents: List[Document], chunk_size: int = 1000, chunk
         for chunk in chunks:
             chunk.metadata.update({
                 "chunk_type": "word_document",
-                "searchable_content": " ".join(chunk.page_content.split()[:20])  # First 20 words for search
+                "searchable_content": " ".join(chunk.page_content.split(None, 20)[:20])  # First 20 words for search
             })
         chunked_docs.extend(chunks)
     
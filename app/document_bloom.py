@@ -0,0 +1,132 @@
+"""
+Document Bloom Filter
+
+Persistent Bloom filter of indexed document content hashes, used by incremental
+vectorstore updates to skip re-embedding chunks that are already stored.
+"""
+
+import hashlib
+import math
+import os
+import struct
+from typing import Iterable, List
+
+from langchain_core.documents import Document
+
+DOC_BLOOM_FILE = "./data/doc_bloom.bin"
+
+# File header: magic, bit count, hash count, items added
+_HEADER = struct.Struct("<4sQII")
+_MAGIC = b"DBF1"
+
+
+def content_digest(text: str) -> bytes:
+    """Hash document content into the 16-byte digest stored in the filter."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class DocumentBloomFilter:
+    """Fixed-size Bloom filter over document content digests."""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-4):
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: bytes):
+        """Derive bit positions from one digest via double hashing."""
+        h1, h2 = struct.unpack("<QQ", digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+    def add(self, digest: bytes) -> None:
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, texts: Iterable[str]) -> None:
+        for text in texts:
+            self.add(content_digest(text))
+
+    def save(self, path: str = DOC_BLOOM_FILE) -> None:
+        """Write the filter to disk atomically."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.num_bits, self.num_hashes, self.count))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DOC_BLOOM_FILE):
+        """Load a filter from disk, or return None if missing or unreadable."""
+        try:
+            with open(path, "rb") as f:
+                magic, num_bits, num_hashes, count = _HEADER.unpack(f.read(_HEADER.size))
+                bits = bytearray(f.read())
+        except (OSError, struct.error):
+            return None
+
+        if magic != _MAGIC or len(bits) != (num_bits + 7) // 8:
+            return None
+
+        bloom = cls.__new__(cls)
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bits
+        bloom.count = count
+        return bloom
+
+
+def _iter_stored_texts(vectorstore, page_size: int = 5000):
+    """Yield the text of every document already in the vectorstore."""
+    if hasattr(vectorstore, "_collection"):
+        offset = 0
+        while True:
+            batch = vectorstore._collection.get(include=["documents"], limit=page_size, offset=offset)
+            documents = batch.get("documents") or []
+            if not documents:
+                break
+            yield from documents
+            offset += len(documents)
+    else:
+        for doc in vectorstore.collection.find({}, {"text": 1, "_id": 0}):
+            yield doc.get("text", "")
+
+
+def load_or_build_bloom(vectorstore, path: str = DOC_BLOOM_FILE) -> DocumentBloomFilter:
+    """Load the persisted filter, rebuilding it from the vectorstore contents if missing."""
+    bloom = DocumentBloomFilter.load(path)
+    if bloom is not None:
+        return bloom
+
+    print("[*] Building document bloom filter from existing vectorstore...")
+    bloom = DocumentBloomFilter()
+    bloom.update(_iter_stored_texts(vectorstore))
+    bloom.save(path)
+    print(f"[OK] Document bloom filter built with {bloom.count} entries")
+    return bloom
+
+
+def skip_indexed_documents(docs: List[Document], bloom: DocumentBloomFilter) -> List[Document]:
+    """Drop documents whose content is already indexed (or repeated within the batch)."""
+    keep = []
+    for doc in docs:
+        digest = content_digest(doc.page_content)
+        if digest in bloom:
+            continue
+        bloom.add(digest)
+        keep.append(doc)
+    return keep
+
+
+def reset_bloom(path: str = DOC_BLOOM_FILE) -> None:
+    """Delete the persisted filter (call whenever the vectorstore is rebuilt from scratch)."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
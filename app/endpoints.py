@@ -8,6 +8,7 @@ import os
 import json
 import asyncio
 import re
+from collections import Counter
 from datetime import datetime
 
 from app.llm import setup_qa_chain
@@ -75,40 +76,48 @@ def find_similar_corrected_response(question: str, threshold: float = 0.7):
     
     return None
 
+# Common conversational patterns, compiled once at import
+CONVERSATIONAL_PATTERNS = [re.compile(pattern) for pattern in (
+    r'^(hi|hello|hey|hiya|howdy)',
+    r'^(how are you|how\'re you|how do you do)',
+    r'^(what\'s up|whats up|wassup)',
+    r'^(good morning|good afternoon|good evening)',
+    r'^(thanks|thank you|thx)',
+    r'^(bye|goodbye|see you|farewell)',
+    r'^(yes|no|ok|okay|sure|alright)',
+    r'^(what|who|where|when|why|how)\s+(are you|is it|was it)',
+    r'^(tell me about yourself|who are you)',
+    r'^(what can you do|what do you do)',
+    r'^(help|can you help)',
+    r'^(sorry|excuse me|pardon)',
+    r'^(nice|good|great|awesome|cool|wow)',
+    r'^(please|pls)',
+)]
+
+# Matched as whole words against the tokenized question, so e.g. 'hi' no longer
+# matches inside "which" or "this"
+QUESTION_WORDS = frozenset({'what', 'how', 'why', 'when', 'where', 'who', 'which'})
+SOCIAL_WORDS = frozenset({'hi', 'hello', 'hey', 'thanks', 'bye', 'good', 'nice', 'great', 'cool', 'awesome'})
+WORD_PATTERN = re.compile(r"\w+")
+
 def is_conversational_query(question: str) -> bool:
     """Determine if a query is conversational/social rather than informational."""
     question_lower = question.lower().strip()
     
-    # Common conversational patterns
-    conversational_patterns = [
-        r'^(hi|hello|hey|hiya|howdy)',
-        r'^(how are you|how\'re you|how do you do)',
-        r'^(what\'s up|whats up|wassup)',
-        r'^(good morning|good afternoon|good evening)',
-        r'^(thanks|thank you|thx)',
-        r'^(bye|goodbye|see you|farewell)',
-        r'^(yes|no|ok|okay|sure|alright)',
-        r'^(what|who|where|when|why|how)\s+(are you|is it|was it)',
-        r'^(tell me about yourself|who are you)',
-        r'^(what can you do|what do you do)',
-        r'^(help|can you help)',
-        r'^(sorry|excuse me|pardon)',
-        r'^(nice|good|great|awesome|cool|wow)',
-        r'^(please|pls)',
-    ]
-    
     # Check if question matches conversational patterns
-    for pattern in conversational_patterns:
-        if re.match(pattern, question_lower):
+    for pattern in CONVERSATIONAL_PATTERNS:
+        if pattern.match(question_lower):
             return True
     
+    # Tokenize once; each word list check is then a single set operation
+    words = set(WORD_PATTERN.findall(question_lower))
+    
     # Check for very short queries (likely conversational)
-    if len(question.strip()) < 10 and not any(word in question_lower for word in ['what', 'how', 'why', 'when', 'where', 'who', 'which']):
+    if len(question.strip()) < 10 and QUESTION_WORDS.isdisjoint(words):
         return True
     
     # Check if it's a simple greeting or social interaction
-    social_words = ['hi', 'hello', 'hey', 'thanks', 'bye', 'good', 'nice', 'great', 'cool', 'awesome']
-    if any(word in question_lower for word in social_words) and len(question.split()) <= 3:
+    if not SOCIAL_WORDS.isdisjoint(words) and len(question.split()) <= 3:
         return True
     
     return False
@@ -273,11 +282,11 @@ async def chat_stream(request: Request):
                 full_response = ""
                 messages = conversational_prompt.format_messages(question=enhanced_query)
                 async for chunk in llm.astream(messages):
-                    if hasattr(chunk, 'content'):
-                        token = chunk.content
-                        full_response += token
-                        yield f"data: {json.dumps({'token': token, 'type': 'token'})}\n\n"
-                        await asyncio.sleep(0.01)
+                    # ChatOpenAI.astream always yields AIMessageChunk, which has .content
+                    token = chunk.content
+                    full_response += token
+                    yield f"data: {json.dumps({'token': token, 'type': 'token'})}\n\n"
+                    await asyncio.sleep(0.01)
                 
                 # Add to conversation
                 await add_to_conversation(conversation_id, "user", question)
@@ -311,7 +320,7 @@ async def chat_stream(request: Request):
             
             try:
                 # Check if vectorstore is available
-                if vectorstore is None:
+                if not vectorstore:
                     print("Warning: Vectorstore not initialized. Please rebuild vectorstore manually.")
                     final_docs = []
                 else:
@@ -354,11 +363,10 @@ async def chat_stream(request: Request):
             full_response = ""
             messages = prompt_template.format_messages(context=context_text, question=enhanced_query)
             async for chunk in llm.astream(messages):
-                if hasattr(chunk, 'content'):
-                    token = chunk.content
-                    full_response += token
-                    yield f"data: {json.dumps({'token': token, 'type': 'token'})}\n\n"
-                    await asyncio.sleep(0.01)  # Small delay for better streaming effect
+                token = chunk.content
+                full_response += token
+                yield f"data: {json.dumps({'token': token, 'type': 'token'})}\n\n"
+                await asyncio.sleep(0.01)  # Small delay for better streaming effect
             
             
             # Add both user question and bot response to conversation AFTER processing
@@ -537,17 +545,15 @@ async def get_feedback_stats_for_question(trace_id: str) -> dict:
         # In a real implementation, you'd query Langfuse API for feedback history
         # For now, we'll simulate with local data
         
-        # Get all feedback for this trace from MongoDB
-        all_feedback = mongodb_data.get_feedback()
-        trace_feedback = [f for f in all_feedback if f.get('trace_id') == trace_id]
+        # Get only this trace's feedback from MongoDB
+        trace_feedback = mongodb_data.get_feedback(trace_id=trace_id)
         
-        # Calculate stats
-        negative_count = sum(1 for f in trace_feedback if f.get('rating') == 'thumbs_down')
-        positive_count = sum(1 for f in trace_feedback if f.get('rating') == 'thumbs_up')
+        # Calculate stats in one pass
+        ratings = Counter(f.get('rating') for f in trace_feedback)
         
         return {
-            'negative_count': negative_count,
-            'positive_count': positive_count,
+            'negative_count': ratings['thumbs_down'],
+            'positive_count': ratings['thumbs_up'],
             'total_count': len(trace_feedback),
             'question_asked_before': len(trace_feedback) > 0,
             'feedback_history': trace_feedback
@@ -877,7 +883,7 @@ async def generate_improved_response(user_query: str, bad_response: str, user_co
         
         # CRITICAL: Retrieve relevant documents from vectorstore for context
         # This ensures the corrected response is based on actual knowledge base
-        if vectorstore is None:
+        if not vectorstore:
             print("Warning: Vectorstore not initialized. Cannot retrieve context for improved response.")
             relevant_docs = []
         else:
@@ -15,6 +15,15 @@ from app.doc_processor import process_doc_directory, chunk_doc_documents
 from app.sharepoint_processor import process_sharepoint_content
 
 
+_embeddings = None
+
+def get_embeddings():
+    """Return the shared OpenAIEmbeddings instance (one client and connection pool per process)."""
+    global _embeddings
+    if _embeddings is None:
+        _embeddings = OpenAIEmbeddings()
+    return _embeddings
+
 def fetch_posts(base_url: str, per_page=10, max_pages=6, start_page=1, extra_params: dict | None = None):
     """Fetch posts from WordPress API with pagination support.
 
@@ -46,8 +55,8 @@ def fetch_posts(base_url: str, per_page=10, max_pages=6, start_page=1, extra_par
     
     return all_posts
 
-def load_webpage(url: str):
-    """Fetch posts from WordPress API and return raw text."""
+def load_webpage_posts(url: str):
+    """Fetch posts from WordPress API and return each post's rendered HTML."""
     # Check if URL contains pagination parameters to determine if we should use pagination
     if "per_page=" in url and "page=" in url:
         # Single page request - use original method
@@ -74,7 +83,20 @@ def load_webpage(url: str):
     for post in data:
         if "content" in post and "rendered" in post["content"]:
             texts.append(post["content"]["rendered"])
-    return "\n\n".join(texts)
+    return texts
+
+def load_webpage(url: str):
+    """Fetch posts from WordPress API and return raw text."""
+    return "\n\n".join(load_webpage_posts(url))
+
+def clean_web_posts(posts):
+    """Strip HTML from each post on its own and join the text.
+
+    Parsing post by post avoids building and re-scanning one document-sized
+    blob, and an unclosed tag can no longer swallow the following posts.
+    """
+    cleaned = (BeautifulSoup(post, "html.parser").get_text(separator="\n", strip=True) for post in posts)
+    return "\n".join(text for text in cleaned if text)
 
 def fetch_web_content(url: str):
     """Fetch and chunk web content into LangChain Documents for incremental updates.
@@ -82,14 +104,13 @@ def fetch_web_content(url: str):
     Respects BLOG_POSTS_PER_PAGE, BLOG_MAX_PAGES, and BLOG_START_PAGE to allow
     continuing partial fetches without reprocessing earlier pages.
     """
-    # Load raw text via pagination-aware loader
-    raw_text = load_webpage(url)
+    # Load raw posts via pagination-aware loader
+    posts = load_webpage_posts(url)
 
     # Clean HTML tags from web content for better semantic search
     print("Cleaning HTML tags from web content...")
-    soup = BeautifulSoup(raw_text, "html.parser")
-    clean_text = soup.get_text(separator="\n", strip=True)
-    print(f"[OK] Cleaned web content: {len(raw_text)} chars -> {len(clean_text)} chars")
+    clean_text = clean_web_posts(posts)
+    print(f"[OK] Cleaned web content: {sum(map(len, posts))} chars -> {len(clean_text)} chars")
 
     # Chunking strategy consistent with vectorstore builders
     splitter = RecursiveCharacterTextSplitter(
@@ -125,13 +146,12 @@ def preserve_markdown(md_text: str) -> str:
 
 def build_vectorstore(url: str):
     """Build and persist embeddings for web documents."""
-    raw_text = load_webpage(url)
+    posts = load_webpage_posts(url)
     
     # CRITICAL: Clean HTML tags from web content for better semantic search
     print("Cleaning HTML tags from web content...")
-    soup = BeautifulSoup(raw_text, "html.parser")
-    clean_text = soup.get_text(separator="\n", strip=True)
-    print(f"[OK] Cleaned web content: {len(raw_text)} chars -> {len(clean_text)} chars")
+    clean_text = clean_web_posts(posts)
+    print(f"[OK] Cleaned web content: {sum(map(len, posts))} chars -> {len(clean_text)} chars")
     
     # Use larger chunks with more overlap for better semantic search
     splitter = RecursiveCharacterTextSplitter(
@@ -140,7 +160,7 @@ def build_vectorstore(url: str):
         separators=["\n\n", "\n", ". ", " ", ""]  # Smart splitting by paragraphs, sentences
     )
     docs = splitter.create_documents([clean_text])
-    embeddings = OpenAIEmbeddings()
+    embeddings = get_embeddings()
     vectorstore = Chroma.from_documents(docs, embeddings, persist_directory=CHROMA_DB_PATH)
     return vectorstore
 
@@ -165,13 +185,12 @@ def build_combined_vectorstore(url: str = None, pdf_directory: str = None, excel
     # Process web content if URL provided
     if url:
         print("Loading web content...")
-        raw_text = load_webpage(url)
+        posts = load_webpage_posts(url)
         
         # CRITICAL: Clean HTML tags from web content for better semantic search
         print("Cleaning HTML tags from web content...")
-        soup = BeautifulSoup(raw_text, "html.parser")
-        clean_text = soup.get_text(separator="\n", strip=True)
-        print(f"[OK] Cleaned web content: {len(raw_text)} chars -> {len(clean_text)} chars")
+        clean_text = clean_web_posts(posts)
+        print(f"[OK] Cleaned web content: {sum(map(len, posts))} chars -> {len(clean_text)} chars")
         
         # Use larger chunks with more overlap for better semantic search
         web_splitter = RecursiveCharacterTextSplitter(
@@ -237,7 +256,7 @@ def build_combined_vectorstore(url: str = None, pdf_directory: str = None, excel
     print(f"Total documents to process: {len(all_docs)}")
     
     # Create embeddings and vectorstore
-    embeddings = OpenAIEmbeddings()
+    embeddings = get_embeddings()
     vectorstore = Chroma.from_documents(all_docs, embeddings, persist_directory=CHROMA_DB_PATH)
     
     print("Selective knowledge base created successfully!")
@@ -219,8 +219,8 @@ class LangfuseTracker:
                 evaluations.append({
                     'name': score.name,
                     'value': score.value,
-                    'comment': score.comment if hasattr(score, 'comment') else None,
-                    'timestamp': score.timestamp if hasattr(score, 'timestamp') else None
+                    'comment': getattr(score, 'comment', None),
+                    'timestamp': getattr(score, 'timestamp', None)
                 })
             
             return evaluations
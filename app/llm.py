@@ -1,5 +1,6 @@
 
 import asyncio
+from datetime import datetime
 from langchain_core.callbacks.base import BaseCallbackHandler
 from langchain_openai import ChatOpenAI
 # RetrievalQA is now handled differently in langchain 1.x
@@ -37,13 +38,12 @@ def setup_qa_chain(retriever):
         formatted_parts = []
         
         for i, doc in enumerate(docs, 1):
-            # Extract metadata
-            metadata = doc.metadata
-            file_name = metadata.get('file_name', metadata.get('source', 'Unknown'))
-            folder_path = metadata.get('folder_path', '')
-            file_type = metadata.get('file_type', '')
-            last_modified = metadata.get('last_modified', '')
-            page_number = metadata.get('page_number', '')
+            # Extract metadata (bind the lookup once per document)
+            mget = doc.metadata.get
+            file_name = mget('file_name', mget('source', 'Unknown'))
+            folder_path = mget('folder_path', '')
+            last_modified = mget('last_modified', '')
+            page_number = mget('page_number', '')
             
             # Build source citation
             source_info = f"[Document {i}]"
@@ -62,7 +62,6 @@ def setup_qa_chain(retriever):
                 # Add last modified date if recent
                 if last_modified:
                     try:
-                        from datetime import datetime
                         # Parse and format date
                         modified_date = datetime.fromisoformat(last_modified.replace('Z', '+00:00'))
                         date_str = modified_date.strftime('%Y-%m-%d')
@@ -114,9 +113,18 @@ def setup_qa_chain(retriever):
                 rephrased_queries = [line.strip() for line in rephrase_result.content.split('\n') if line.strip()]
                 
                 # Search with each rephrased query
-                for rephrased_query in rephrased_queries[:2]:  # Limit to 2 rephrasings
-                    additional_docs = vectorstore.similarity_search(rephrased_query, k=12)
-                    relevant_docs.extend(additional_docs)
+                rephrased_queries = rephrased_queries[:2]  # Limit to 2 rephrasings
+                if rephrased_queries:
+                    # Embed all rephrasings in one API call instead of one per query
+                    rephrased_embeddings = vectorstore.embeddings.embed_documents(rephrased_queries)
+                    if hasattr(vectorstore, 'similarity_search_by_vectors'):
+                        # MongoDB store: score all rephrasings in one pass and one fetch
+                        for additional_docs in vectorstore.similarity_search_by_vectors(rephrased_embeddings, k=12):
+                            relevant_docs.extend(additional_docs)
+                    else:
+                        for rephrased_embedding in rephrased_embeddings:
+                            additional_docs = vectorstore.similarity_search_by_vector(rephrased_embedding, k=12)
+                            relevant_docs.extend(additional_docs)
                     
             except Exception as e:
                 # If rephrasing fails, continue with original query only
@@ -128,8 +136,10 @@ def setup_qa_chain(retriever):
             unique_docs = []
             
             for doc in relevant_docs:
-                # Create a unique identifier for the document
-                doc_id = f"{doc.metadata.get('source', '')}_{doc.page_content[:50]}"
+                # Identify the chunk by its stored id; fall back to its full content.
+                # (A 50-char prefix merged distinct chunks that share an opening,
+                # e.g. enriched SharePoint chunks that all start with the page title.)
+                doc_id = doc.metadata.get('_id') or getattr(doc, 'id', None) or (doc.metadata.get('source', ''), doc.page_content)
                 if doc_id not in seen_ids:
                     seen_ids.add(doc_id)
                     unique_docs.append(doc)
@@ -52,9 +52,13 @@ class MongoDBDataManager:
     
     # ==================== FEEDBACK ====================
     
-    def get_feedback(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get feedback, optionally filtered by user."""
-        query = {"user_id": user_id} if user_id else {}
+    def get_feedback(self, user_id: Optional[str] = None, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get feedback, optionally filtered by user and/or trace."""
+        query = {}
+        if user_id:
+            query["user_id"] = user_id
+        if trace_id:
+            query["trace_id"] = trace_id
         return list(self.db["feedback_history"].find(query))
     
     def add_feedback(self, feedback: Dict[str, Any]):
@@ -64,9 +68,12 @@ class MongoDBDataManager:
     
     def get_feedback_stats(self) -> Dict[str, int]:
         """Get feedback statistics."""
-        total = self.db["feedback_history"].count_documents({})
-        positive = self.db["feedback_history"].count_documents({"rating": "positive"})
-        negative = self.db["feedback_history"].count_documents({"rating": "negative"})
+        # One grouped scan instead of a count query per rating
+        pipeline = [{"$group": {"_id": "$rating", "count": {"$sum": 1}}}]
+        counts = {row["_id"]: row["count"] for row in self.db["feedback_history"].aggregate(pipeline)}
+        total = sum(counts.values())
+        positive = counts.get("positive", 0)
+        negative = counts.get("negative", 0)
         return {
             "total": total,
             "positive": positive,
@@ -123,11 +130,11 @@ class MongoDBDataManager:
         return {
             "fine_tuning_corrections": self.db["fine_tuning_data"].count_documents({"type": "correction"}),
             "fine_tuning_training_data": self.db["fine_tuning_data"].count_documents({"type": "training_data"}),
-            "feedback_items": self.db["feedback_history"].count_documents({}),
-            "corrected_responses": self.db["corrected_responses"].count_documents({}),
-            "bad_responses": self.db["bad_responses"].count_documents({}),
-            "chat_histories": self.db["chat_histories"].count_documents({}),
-            "vector_documents": self.db["cloudfuze_vectorstore"].count_documents({}),
+            "feedback_items": self.db["feedback_history"].estimated_document_count(),
+            "corrected_responses": self.db["corrected_responses"].estimated_document_count(),
+            "bad_responses": self.db["bad_responses"].estimated_document_count(),
+            "chat_histories": self.db["chat_histories"].estimated_document_count(),
+            "vector_documents": self.db["cloudfuze_vectorstore"].estimated_document_count(),
         }
     
     def __del__(self):
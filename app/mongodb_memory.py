@@ -218,7 +218,7 @@ class MongoDBMemoryManager:
         await self.connect()
         
         try:
-            total_users = await self.collection.count_documents({})
+            total_users = await self.collection.estimated_document_count()
             
             # Get total messages across all users
             pipeline = [
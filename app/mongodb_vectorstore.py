@@ -5,6 +5,11 @@ Compatible with MongoDB Atlas Vector Search or local MongoDB.
 """
 
 import asyncio
+import functools
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 import numpy as np
@@ -18,6 +23,68 @@ from pymongo.errors import CollectionInvalid
 
 from config import MONGODB_URL, MONGODB_DATABASE
 
+# The persisted index lists every document id; orjson parses it several times faster
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Corpora at least this large are scored in parallel shards (numpy releases the GIL)
+SEARCH_SHARD_MIN_ROWS = 50_000
+SEARCH_SHARDS = min(8, os.cpu_count() or 1)
+
+# Persisted embedding matrices, reloaded across restarts while the corpus is unchanged
+VECTOR_INDEX_DIR = "./data/vector_index"
+
+# Index precision: float32 halves memory and bandwidth versus numpy's float64 default,
+# and is well within the precision OpenAI embeddings are served at
+INDEX_DTYPE = np.float32
+
+# Repeated queries reuse their embedding instead of calling the embeddings API again
+QUERY_EMBEDDING_CACHE_SIZE = 4096
+
+# Per-collection write counters; every writer bumps one so in-place updates invalidate the index
+INDEX_VERSION_COLLECTION = "vector_index_versions"
+
+_search_pool = None
+
+
+def mark_vectors_changed(collection) -> None:
+    """
+    Bump the write counter for a vector collection.
+    
+    Call this after changing stored texts or embeddings outside MongoDBVectorStore
+    (e.g. update_one on a document), so cached embedding indexes are rebuilt.
+    """
+    collection.database[INDEX_VERSION_COLLECTION].update_one(
+        {"_id": collection.name}, {"$inc": {"version": 1}}, upsert=True
+    )
+
+
+def _get_search_pool() -> ThreadPoolExecutor:
+    """Return the shared thread pool used for sharded similarity scoring."""
+    global _search_pool
+    if _search_pool is None:
+        _search_pool = ThreadPoolExecutor(max_workers=SEARCH_SHARDS, thread_name_prefix="vector-search")
+    return _search_pool
+
+
+def _score_rows(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Dot every row of the matrix with the query, splitting large matrices across threads."""
+    rows = len(matrix)
+    if rows < SEARCH_SHARD_MIN_ROWS or SEARCH_SHARDS < 2:
+        return matrix @ query
+
+    scores = np.empty(rows, dtype=np.result_type(matrix, query))
+    bounds = np.linspace(0, rows, SEARCH_SHARDS + 1, dtype=int)
+
+    def score_shard(start: int, end: int) -> None:
+        np.dot(matrix[start:end], query, out=scores[start:end])
+
+    list(_get_search_pool().map(score_shard, bounds[:-1], bounds[1:]))
+    return scores
+
 
 class MongoDBVectorStore(VectorStore):
     """
@@ -57,6 +124,13 @@ class MongoDBVectorStore(VectorStore):
         self.db = self.client[database_name]
         self.collection = self.db[collection_name]
         
+        # In-memory matrix of normalized embeddings, rebuilt when the corpus changes
+        self._index = None
+        self._index_version = None
+        self._index_lock = threading.Lock()
+        
+        self._embed_query_cached = functools.lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)(self._embed_query_uncached)
+        
         # Create indexes for better performance
         self._ensure_indexes()
         
@@ -67,6 +141,9 @@ class MongoDBVectorStore(VectorStore):
         try:
             # Index on metadata fields for filtering
             self.collection.create_index([("metadata.source", 1)])
+            self.collection.create_index([("metadata.source_type", 1)])
+            self.collection.create_index([("metadata.file_path", 1)])
+            self.collection.create_index([("metadata.sharepoint_url", 1)])
             self.collection.create_index([("created_at", -1)])
         except Exception as e:
             print(f"[WARNING] Could not create indexes: {e}")
@@ -90,10 +167,195 @@ class MongoDBVectorStore(VectorStore):
         
         return dot_product / (norm1 * norm2)
     
+    def _embed_query_uncached(self, query: str) -> Tuple[float, ...]:
+        return tuple(self.embedding_function.embed_query(query))
+    
+    def _embed_query(self, query: str) -> Tuple[float, ...]:
+        """Embed a query, reusing the cached vector for queries seen before."""
+        return self._embed_query_cached(query)
+    
+    def _corpus_version(self) -> Tuple[int, Optional[str], int]:
+        """Cheap fingerprint of the collection contents (document count, newest _id, write counter)."""
+        latest = self.collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        counter = self.db[INDEX_VERSION_COLLECTION].find_one({"_id": self.collection_name})
+        return (
+            self.collection.estimated_document_count(),
+            str(latest["_id"]) if latest else None,
+            counter["version"] if counter else 0,
+        )
+    
+    def _index_paths(self) -> Tuple[str, str]:
+        base = os.path.join(VECTOR_INDEX_DIR, f"{self.database_name}.{self.collection_name}")
+        return f"{base}.npy", f"{base}.json"
+    
+    def _load_index_from_disk(self, version: Tuple[int, Optional[str], int]):
+        """Memory-map a persisted index if it was built for this corpus version, else return None."""
+        from bson import ObjectId
+        from bson.errors import InvalidId
+        
+        matrix_path, meta_path = self._index_paths()
+        try:
+            with open(meta_path, "rb") as f:
+                raw = f.read()
+            meta = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+            if tuple(meta["version"]) != version:
+                return None
+            matrix = np.load(matrix_path, mmap_mode="r")
+            ids = [ObjectId(doc_id) for doc_id in meta["ids"]]
+        except (OSError, ValueError, KeyError, TypeError, InvalidId):
+            return None
+        
+        if len(matrix) != len(ids) or matrix.dtype != INDEX_DTYPE:
+            return None
+        return ids, matrix
+    
+    def _save_index_to_disk(self, version: Tuple[int, Optional[str], int], ids: List[Any], matrix: np.ndarray) -> None:
+        """Write the index atomically (matrix first, then the metadata that points at it)."""
+        matrix_path, meta_path = self._index_paths()
+        try:
+            os.makedirs(VECTOR_INDEX_DIR, exist_ok=True)
+            with open(f"{matrix_path}.tmp", "wb") as f:
+                np.save(f, matrix)
+            os.replace(f"{matrix_path}.tmp", matrix_path)
+            meta = {"version": list(version), "ids": [str(doc_id) for doc_id in ids]}
+            payload = orjson.dumps(meta) if ORJSON_AVAILABLE else json.dumps(meta).encode("utf-8")
+            with open(f"{meta_path}.tmp", "wb") as f:
+                f.write(payload)
+            os.replace(f"{meta_path}.tmp", meta_path)
+        except OSError as e:
+            print(f"[WARNING] Could not persist embedding index: {e}")
+    
+    def _invalidate_index(self) -> None:
+        """Record a write and drop the in-memory embedding matrix so the next search rebuilds it."""
+        mark_vectors_changed(self.collection)
+        self._index = None
+        self._index_version = None
+    
+    def _get_index(self):
+        """
+        Return (ids, positions, matrix) for every stored embedding.
+        
+        Rows of the matrix are L2-normalized at build time, so cosine similarity
+        against a normalized query is a single matrix-vector product.
+        """
+        version = self._corpus_version()
+        with self._index_lock:
+            if self._index is not None and self._index_version == version:
+                return self._index
+            
+            persisted = self._load_index_from_disk(version)
+            if persisted is not None:
+                ids, matrix = persisted
+                print(f"[OK] Loaded embedding index from disk: {len(ids)} vectors")
+            else:
+                ids = []
+                vectors = []
+                for doc in self.collection.find({}, {"embedding": 1}):
+                    ids.append(doc["_id"])
+                    vectors.append(doc["embedding"])
+                
+                if not ids:
+                    # Nothing to reshape, normalize or persist for an empty collection
+                    self._index = ([], {}, np.empty((0, 0), dtype=INDEX_DTYPE))
+                    self._index_version = version
+                    return self._index
+                
+                matrix = np.asarray(vectors, dtype=INDEX_DTYPE)
+                if matrix.ndim != 2:
+                    matrix = matrix.reshape(len(ids), -1)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                matrix /= norms
+                
+                self._save_index_to_disk(version, ids, matrix)
+                print(f"[OK] Built in-memory embedding index: {len(ids)} vectors")
+            
+            self._index = (ids, {doc_id: i for i, doc_id in enumerate(ids)}, matrix)
+            self._index_version = version
+            return self._index
+    
+    def _search_by_vector(
+        self,
+        query_embedding: List[float],
+        k: int,
+        filter: Optional[dict] = None,
+        projection: Optional[dict] = None,
+    ) -> List[Tuple[dict, float]]:
+        """
+        Score the query against the embedding index and return the top k (doc, score) pairs.
+        
+        projection selects the fields fetched for the winners (default: all but the embedding).
+        """
+        return self._search_by_vectors([query_embedding], k, filter, projection)[0]
+    
+    def _search_by_vectors(
+        self,
+        query_embeddings: List[List[float]],
+        k: int,
+        filter: Optional[dict] = None,
+        projection: Optional[dict] = None,
+    ) -> List[List[Tuple[dict, float]]]:
+        """
+        Top k (doc, score) pairs for each query, from one scoring pass and one fetch.
+        
+        The winners of every query are fetched together in a single $in query.
+        """
+        ids, positions, matrix = self._get_index()
+        if not ids or k <= 0 or not query_embeddings:
+            return [[] for _ in query_embeddings]
+        
+        queries = np.asarray(query_embeddings, dtype=matrix.dtype)
+        query_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        valid = query_norms[:, 0] != 0
+        query_norms[~valid] = 1.0
+        queries = queries / query_norms
+        
+        if filter:
+            rows = np.fromiter(
+                (positions[d["_id"]] for d in self.collection.find(filter, {"_id": 1}) if d["_id"] in positions),
+                dtype=np.intp,
+            )
+            candidates = matrix[rows]
+        else:
+            rows = None
+            candidates = matrix
+        
+        if len(queries) == 1:
+            score_rows = [_score_rows(candidates, queries[0])]
+        else:
+            # One matrix product scores every query against every candidate
+            score_rows = list((candidates @ queries.T).T)
+        
+        ranked = []
+        for is_valid, scores in zip(valid, score_rows):
+            if not is_valid:
+                ranked.append([])
+                continue
+            # Partition out the top k in O(n), then sort just those
+            if k < len(scores):
+                order = np.argpartition(scores, -k)[-k:]
+            else:
+                order = np.arange(len(scores))
+            order = order[np.argsort(scores[order])[::-1]]
+            top_rows = rows[order] if rows is not None else order
+            ranked.append([(ids[i], float(scores[j])) for i, j in zip(top_rows, order)])
+        
+        # Fetch only the winners, without their embeddings
+        top_ids = list({doc_id for hits in ranked for doc_id, _ in hits})
+        docs = {
+            doc["_id"]: doc
+            for doc in self.collection.find({"_id": {"$in": top_ids}}, projection or {"embedding": 0})
+        } if top_ids else {}
+        return [
+            [(docs[doc_id], score) for doc_id, score in hits if doc_id in docs]
+            for hits in ranked
+        ]
+    
     def add_texts(
         self,
         texts: List[str],
         metadatas: Optional[List[dict]] = None,
+        embeddings: Optional[List[List[float]]] = None,
         **kwargs: Any,
     ) -> List[str]:
         """
@@ -102,15 +364,17 @@ class MongoDBVectorStore(VectorStore):
         Args:
             texts: List of text strings to add
             metadatas: Optional list of metadata dicts
+            embeddings: Optional precomputed embeddings (skips the embedding call)
             
         Returns:
             List of document IDs
         """
-        if not self.embedding_function:
-            raise ValueError("Embedding function is required")
-        
-        # Generate embeddings
-        embeddings = self.embedding_function.embed_documents(texts)
+        if embeddings is None:
+            if not self.embedding_function:
+                raise ValueError("Embedding function is required")
+            
+            # Generate embeddings
+            embeddings = self.embedding_function.embed_documents(texts)
         
         # Prepare documents
         documents = []
@@ -126,6 +390,7 @@ class MongoDBVectorStore(VectorStore):
         # Insert into MongoDB
         result = self.collection.insert_many(documents)
         doc_ids = [str(id) for id in result.inserted_ids]
+        self._invalidate_index()
         
         print(f"[OK] Added {len(doc_ids)} documents to MongoDB vector store")
         return doc_ids
@@ -170,40 +435,97 @@ class MongoDBVectorStore(VectorStore):
             raise ValueError("Embedding function is required")
         
         # Generate query embedding
-        query_embedding = self.embedding_function.embed_query(query)
+        query_embedding = self._embed_query(query)
         
-        # Build MongoDB query
-        mongo_filter = filter if filter else {}
+        return self.similarity_search_by_vector(query_embedding, k, filter)
+    
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        """
+        Perform similarity search with a precomputed query embedding.
         
-        # Fetch all documents (for cosine similarity calculation)
+        Args:
+            embedding: Query embedding
+            k: Number of results to return
+            filter: Optional metadata filter
+            
+        Returns:
+            List of similar documents
+        """
+        # Score against the in-memory embedding index
         # For production with large datasets, use MongoDB Atlas Vector Search
-        cursor = self.collection.find(mongo_filter)
+        top_results = self._search_by_vector(embedding, k, filter)
         
-        # Calculate similarities
-        results = []
-        for doc in cursor:
-            similarity = self._cosine_similarity(query_embedding, doc["embedding"])
-            results.append((doc, similarity))
+        # Convert to LangChain documents
+        return [self._to_document(doc, score) for doc, score in top_results]
+    
+    @staticmethod
+    def _to_document(doc: dict, score: float) -> Document:
+        """Convert a stored document into a LangChain Document carrying its score and id."""
+        return Document(
+            page_content=doc["text"],
+            metadata={
+                **doc["metadata"],
+                "score": score,
+                "_id": str(doc["_id"]),
+            }
+        )
+    
+    def similarity_search_by_vectors(
+        self,
+        embeddings: List[List[float]],
+        k: int = 4,
+        filter: Optional[dict] = None,
+    ) -> List[List[Document]]:
+        """
+        Similarity search for several precomputed query embeddings at once.
         
-        # Sort by similarity and take top k
-        results.sort(key=lambda x: x[1], reverse=True)
-        top_results = results[:k]
+        Scores all queries in one pass over the index and fetches every
+        query's results in a single MongoDB round trip.
         
-        # Convert to LangChain documents
-        documents = []
-        for doc, score in top_results:
-            documents.append(
-                Document(
-                    page_content=doc["text"],
-                    metadata={
-                        **doc["metadata"],
-                        "score": score,
-                        "_id": str(doc["_id"]),
-                    }
-                )
-            )
+        Args:
+            embeddings: Query embeddings
+            k: Number of results to return per query
+            filter: Optional metadata filter
+            
+        Returns:
+            One list of similar documents per query, in input order
+        """
+        return [
+            [self._to_document(doc, score) for doc, score in hits]
+            for hits in self._search_by_vectors(embeddings, k, filter)
+        ]
+    
+    def similarity_search_metadata(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[dict] = None,
+    ) -> List[Tuple[dict, float]]:
+        """
+        Return only the metadata of the top k matches, with scores.
+        
+        For distribution checks over many results: the chunk text is never
+        fetched from MongoDB.
         
-        return documents
+        Args:
+            query: Query text
+            k: Number of results to return
+            filter: Optional metadata filter
+            
+        Returns:
+            List of (metadata, score) tuples
+        """
+        if not self.embedding_function:
+            raise ValueError("Embedding function is required")
+        
+        top_results = self._search_by_vector(self._embed_query(query), k, filter, {"metadata": 1})
+        return [(doc.get("metadata", {}), score) for doc, score in top_results]
     
     def similarity_search_with_score(
         self,
@@ -227,23 +549,10 @@ class MongoDBVectorStore(VectorStore):
             raise ValueError("Embedding function is required")
         
         # Generate query embedding
-        query_embedding = self.embedding_function.embed_query(query)
-        
-        # Build MongoDB query
-        mongo_filter = filter if filter else {}
+        query_embedding = self._embed_query(query)
         
-        # Fetch all documents
-        cursor = self.collection.find(mongo_filter)
-        
-        # Calculate similarities
-        results = []
-        for doc in cursor:
-            similarity = self._cosine_similarity(query_embedding, doc["embedding"])
-            results.append((doc, similarity))
-        
-        # Sort by similarity and take top k
-        results.sort(key=lambda x: x[1], reverse=True)
-        top_results = results[:k]
+        # Score against the in-memory embedding index
+        top_results = self._search_by_vector(query_embedding, k, filter)
         
         # Convert to LangChain documents with scores
         documents_with_scores = []
@@ -328,20 +637,37 @@ class MongoDBVectorStore(VectorStore):
         object_ids = [ObjectId(id) for id in ids if ObjectId.is_valid(id)]
         
         result = self.collection.delete_many({"_id": {"$in": object_ids}})
+        self._invalidate_index()
         print(f"[OK] Deleted {result.deleted_count} documents from MongoDB vector store")
         return True
     
+    def delete_where(self, filter: dict) -> int:
+        """
+        Delete every document matching a MongoDB filter in one server-side call.
+        
+        Args:
+            filter: MongoDB filter, e.g. {"metadata.file_path": {"$in": paths}}
+            
+        Returns:
+            Number of documents deleted
+        """
+        result = self.collection.delete_many(filter)
+        if result.deleted_count:
+            self._invalidate_index()
+        return result.deleted_count
+    
     def clear(self) -> None:
         """Clear all documents from the collection."""
         result = self.collection.delete_many({})
+        self._invalidate_index()
         print(f"[OK] Cleared {result.deleted_count} documents from MongoDB vector store")
     
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the collection."""
-        count = self.collection.count_documents({})
+        count = self.collection.estimated_document_count()
         
-        # Get sample document to check embedding dimension
-        sample = self.collection.find_one()
+        # Get sample document to check embedding dimension (skip its text and metadata)
+        sample = self.collection.find_one({}, {"embedding": 1})
         embedding_dim = len(sample["embedding"]) if sample and "embedding" in sample else 0
         
         return {
@@ -435,6 +761,9 @@ class AsyncMongoDBVectorStore:
         # Insert into MongoDB
         result = await self.collection.insert_many(docs_to_insert)
         doc_ids = [str(id) for id in result.inserted_ids]
+        await self.db[INDEX_VERSION_COLLECTION].update_one(
+            {"_id": self.collection_name}, {"$inc": {"version": 1}}, upsert=True
+        )
         
         print(f"[OK] Added {len(doc_ids)} documents to MongoDB vector store (async)")
         return doc_ids
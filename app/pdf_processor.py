@@ -1,6 +1,6 @@
 import os
 import PyPDF2
-from typing import List, Dict
+from typing import List, Dict, Optional, Set
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 
@@ -73,8 +73,12 @@ def extract_text_from_pdf(pdf_path: str) -> str:
     
     return text
 
-def process_pdf_directory(pdf_directory: str) -> List[Document]:
-    """Process all PDF files in a directory and return as LangChain Documents."""
+def process_pdf_directory(pdf_directory: str, only_files: Optional[Set[str]] = None) -> List[Document]:
+    """Process all PDF files in a directory and return as LangChain Documents.
+    
+    If only_files is given, only files whose names are in it are processed
+    (used by incremental rebuilds to skip unchanged files).
+    """
     documents = []
     
     if not os.path.exists(pdf_directory):
@@ -83,6 +87,9 @@ def process_pdf_directory(pdf_directory: str) -> List[Document]:
     
     pdf_files = [f for f in os.listdir(pdf_directory) if f.lower().endswith('.pdf')]
     
+    if only_files is not None:
+        pdf_files = [f for f in pdf_files if f in only_files]
+    
     if not pdf_files:
         print(f"No PDF files found in {pdf_directory}")
         return documents
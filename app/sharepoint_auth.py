@@ -93,8 +93,8 @@ class SharePointAuthenticator:
             if ".sharepoint.com/sites/" in site_url:
                 # Parse the URL
                 parts = site_url.replace("https://", "").replace("http://", "")
-                hostname = parts.split("/")[0]  # cloudfuzecom.sharepoint.com
-                site_path = "/" + "/".join(parts.split("/")[1:])  # /sites/DOC360
+                hostname, _, site_rest = parts.partition("/")  # cloudfuzecom.sharepoint.com
+                site_path = "/" + site_rest  # /sites/DOC360
                 
                 # Use the correct Graph API format
                 test_url = f"https://graph.microsoft.com/v1.0/sites/{hostname}:{site_path}"
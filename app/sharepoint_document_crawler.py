@@ -11,6 +11,8 @@ Crawls SharePoint DOC360 site using Microsoft Graph API to:
 """
 
 import os
+import asyncio
+import aiohttp
 import requests
 import hashlib
 from typing import List, Dict, Any, Optional, Set
@@ -20,6 +22,23 @@ import tempfile
 import time
 
 
+# Concurrent Graph folder listings while prefetching a library's folder tree
+LISTING_CONCURRENCY = 16
+
+# Throttled (429) and unavailable (503) listings are retried this many times,
+# waiting as long as Graph's Retry-After header asks
+LISTING_RETRIES = 4
+RETRY_STATUSES = {429, 503}
+
+
+def _retry_after_seconds(retry_after: Optional[str], attempt: int) -> float:
+    """Seconds to wait before a retry: Graph's Retry-After when given, else exponential backoff."""
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return float(2 ** attempt)
+
+
 class SharePointDocumentCrawler:
     """Crawls SharePoint site and downloads documents using Microsoft Graph API."""
     
@@ -147,12 +166,80 @@ class SharePointDocumentCrawler:
             print(f"[ERROR] Failed to list folder contents: {e}")
             return []
     
+    async def _get_json_async(self, session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+        """GET a Graph URL and decode its JSON, retrying 429/503 responses."""
+        for attempt in range(LISTING_RETRIES + 1):
+            async with session.get(url, headers=self.auth_headers) as response:
+                if response.status not in RETRY_STATUSES or attempt == LISTING_RETRIES:
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+                delay = _retry_after_seconds(response.headers.get('Retry-After'), attempt)
+            print(f"[INFO] Graph returned {response.status}, retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+    
+    async def _list_folder_contents_async(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        drive_id: str,
+        item_id: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Async version of _list_folder_contents, limited by semaphore.
+        
+        Returns None if the folder could not be listed, so the caller can list
+        it (and its subfolders) with the synchronous path instead.
+        """
+        if item_id:
+            url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{item_id}/children"
+        else:
+            url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/root/children"
+        
+        items = []
+        try:
+            async with semaphore:
+                # Handle pagination
+                while url:
+                    data = await self._get_json_async(session, url)
+                    items.extend(data.get('value', []))
+                    url = data.get('@odata.nextLink')
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            # ValueError covers a body that isn't JSON
+            print(f"[WARNING] Prefetch failed for folder {item_id or 'root'}, will list it directly: {e}")
+            return None
+        
+        return items
+    
+    async def _prefetch_folder_tree(self, drive_id: str, max_depth: int) -> Dict[Optional[str], List[Dict[str, Any]]]:
+        """
+        List every folder of a drive down to max_depth, siblings concurrently.
+        
+        Returns {folder item id (None for the root): its children}, which
+        _crawl_folder_recursive then walks in memory in its usual order.
+        Folders whose listing failed are left out, along with their subtree.
+        """
+        listings: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        semaphore = asyncio.Semaphore(LISTING_CONCURRENCY)
+        
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+            async def walk(item_id: Optional[str], depth: int):
+                items = await self._list_folder_contents_async(session, semaphore, drive_id, item_id)
+                if items is None:
+                    return
+                listings[item_id] = items
+                if depth < max_depth:
+                    await asyncio.gather(*(walk(item.get('id'), depth + 1) for item in items if 'folder' in item))
+            
+            await walk(None, 0)
+        
+        return listings
+    
     def _should_process_file(self, item: Dict[str, Any]) -> bool:
         """Determine if a file should be processed."""
         file_name = item.get('name', '').lower()
         
-        # Check file extension
-        file_ext = os.path.splitext(file_name)[1].lower()
+        # Check file extension (file_name is already lowercased)
+        file_ext = os.path.splitext(file_name)[1]
         
         # Skip if in skip list
         if file_ext in self.SKIP_EXTENSIONS:
@@ -181,6 +268,7 @@ class SharePointDocumentCrawler:
         file_name = item.get('name', 'unknown')
         file_ext = os.path.splitext(file_name)[1].lower()
         
+        # file_type is stored lowercase so consumers can compare it directly
         metadata = {
             'file_name': file_name,
             'file_type': file_ext.lstrip('.'),
@@ -233,11 +321,16 @@ class SharePointDocumentCrawler:
         item_id: Optional[str] = None, 
         current_path: str = "",
         depth: int = 0,
-        max_depth: int = 10
+        max_depth: int = 10,
+        listings: Optional[Dict[Optional[str], List[Dict[str, Any]]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Recursively crawl folders and collect file information.
         
+        Args:
+            listings: Folder contents prefetched by _prefetch_folder_tree; folders
+                      found there are read from it, the rest are listed one by one
+        
         Returns:
             List of file metadata dictionaries
         """
@@ -247,7 +340,10 @@ class SharePointDocumentCrawler:
         files_info = []
         
         # List folder contents
-        items = self._list_folder_contents(drive_id, item_id)
+        if listings is not None and item_id in listings:
+            items = listings[item_id]
+        else:
+            items = self._list_folder_contents(drive_id, item_id)
         
         for item in items:
             item_name = item.get('name', 'unknown')
@@ -264,7 +360,8 @@ class SharePointDocumentCrawler:
                     item.get('id'),
                     subfolder_path,
                     depth + 1,
-                    max_depth
+                    max_depth,
+                    listings
                 )
                 files_info.extend(subfolder_files)
             
@@ -286,6 +383,15 @@ class SharePointDocumentCrawler:
         
         return files_info
     
+    @staticmethod
+    def _in_event_loop() -> bool:
+        """Whether an asyncio loop is already running (asyncio.run can't be used then)."""
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+    
     def crawl_site(self) -> List[Dict[str, Any]]:
         """
         Crawl the entire SharePoint site and collect all document metadata.
@@ -320,7 +426,11 @@ class SharePointDocumentCrawler:
             print(f"\n[*] Crawling library: {drive_name}")
             print("-" * 70)
             
-            files = self._crawl_folder_recursive(drive_id, drive_name)
+            listings = None
+            if not self._in_event_loop():
+                # List the whole folder tree concurrently up front
+                listings = asyncio.run(self._prefetch_folder_tree(drive_id, max_depth=10))
+            files = self._crawl_folder_recursive(drive_id, drive_name, listings=listings)
             all_files.extend(files)
             
             print(f"[OK] Found {len(files)} files in {drive_name}")
@@ -128,7 +128,7 @@ class SharePointFileProcessor:
             List of Document objects with chunked content and metadata
         """
         file_name = file_metadata.get('file_name', 'unknown')
-        file_type = file_metadata.get('file_type', '').lower()
+        file_type = file_metadata.get('file_type', '')  # lowercased by the crawler
         
         print(f"[*] Processing: {file_name}")
         
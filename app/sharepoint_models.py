@@ -3,13 +3,15 @@
 SharePoint Data Models
 
 Data models for SharePoint content processing and storage.
+Models are slotted: one instance is created per page, FAQ and table, so they
+skip the per-instance __dict__.
 """
 
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class SharePointPage:
     """Represents a SharePoint page with its content and metadata."""
     
@@ -26,7 +28,7 @@ class SharePointPage:
         if self.child_urls is None:
             self.child_urls = []
 
-@dataclass
+@dataclass(slots=True)
 class SharePointFAQ:
     """Represents a FAQ item extracted from SharePoint."""
     
@@ -36,7 +38,7 @@ class SharePointFAQ:
     page_title: str
     faq_number: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class SharePointTable:
     """Represents a table extracted from SharePoint."""
     
@@ -47,7 +49,7 @@ class SharePointTable:
     page_title: str
     table_type: str = "compatibility_matrix"  # or "feature_definitions", etc.
 
-@dataclass
+@dataclass(slots=True)
 class SharePointCrawlResult:
     """Result of SharePoint crawling operation."""
     
@@ -63,7 +65,7 @@ class SharePointCrawlResult:
         if self.errors is None:
             self.errors = []
 
-@dataclass
+@dataclass(slots=True)
 class SharePointMetadata:
     """Metadata for SharePoint content in vectorstore."""
     
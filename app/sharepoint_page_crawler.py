@@ -3,19 +3,28 @@
 SharePoint Page Crawler using Graph API
 
 Crawls SharePoint pages using Microsoft Graph API to extract page content.
-Follows links recursively and extracts text, tables, and structured content.
+Follows links breadth-first and extracts text, tables, and structured content.
 Much faster and more reliable than Selenium-based extraction.
 """
 
 import os
 import re
+import shelve
 import requests
 import hashlib
-from typing import List, Dict, Any, Optional, Set
+from collections import deque
+from typing import List, Dict, Any, Optional, Set, Tuple
 from urllib.parse import urlparse, urljoin, unquote
 from datetime import datetime
 from langchain_core.documents import Document
 
+# href attributes in webpart innerHtml
+HREF_PATTERN = re.compile(r'href=["\']([^"\']+)["\']')
+
+# Page content from earlier runs, keyed by page id and reused while the page's
+# lastModifiedDateTime is unchanged (one entry per page, so it stays site-sized)
+PAGE_CACHE_PATH = ".cache/sharepoint_pages"
+
 
 class SharePointPageCrawler:
     """Crawls SharePoint pages using Microsoft Graph API."""
@@ -34,7 +43,7 @@ class SharePointPageCrawler:
             site_url: SharePoint site URL
             auth_headers: Authentication headers with Bearer token
             start_page: Starting page path (e.g., /SitePages/Page.aspx)
-            max_depth: Maximum depth for recursive crawling
+            max_depth: Maximum link depth to crawl
         """
         self.site_url = site_url
         self.auth_headers = auth_headers
@@ -50,10 +59,14 @@ class SharePointPageCrawler:
         self.visited_pages: Set[str] = set()
         self.page_documents: List[Document] = []
         
+        # Open for the duration of crawl()
+        self._page_cache = None
+        
         # Statistics
         self.stats = {
             'pages_crawled': 0,
             'pages_skipped': 0,
+            'pages_from_cache': 0,
             'links_found': 0,
             'errors': []
         }
@@ -114,9 +127,14 @@ class SharePointPageCrawler:
         page_path_decoded = unquote(page_path)
         
         # Extract just the filename
-        page_filename = page_path_decoded.split('/')[-1]
+        page_filename = page_path_decoded.rpartition('/')[2]
         page_filename_noext = page_filename.replace('.aspx', '').lower()
         
+        # Loop-invariant lowercased forms, computed once rather than per page
+        page_path_lower = page_path_decoded.lower()
+        page_filename_lower = page_filename.lower()
+        filename_normalized = page_filename_noext.replace(' ', '').replace('_', '')
+        
         print(f"[DEBUG] Looking for page: {page_path_decoded}")
         print(f"[DEBUG] Filename: {page_filename}")
         
@@ -129,18 +147,20 @@ class SharePointPageCrawler:
             web_url_decoded = unquote(web_url)
             
             # Strategy 1: Match full path in URL
-            if page_path_decoded.lower() in web_url_decoded.lower():
+            if page_path_lower in web_url_decoded.lower():
                 print(f"[DEBUG] ✓ Matched by full path: {name}")
                 return page
             
             # Strategy 2: Match by exact filename
-            if name and page_filename.lower() == name.lower():
+            # Graph can return "name": null, which .get() passes through
+            name_lower = (name or '').lower()
+            if name and page_filename_lower == name_lower:
                 print(f"[DEBUG] ✓ Matched by filename: {name}")
                 return page
             
             # Strategy 3: Match by filename without extension
             if name:
-                name_noext = name.replace('.aspx', '').lower()
+                name_noext = name_lower.replace('.aspx', '')
                 if page_filename_noext == name_noext:
                     print(f"[DEBUG] ✓ Matched by filename (no ext): {name}")
                     return page
@@ -148,7 +168,6 @@ class SharePointPageCrawler:
             # Strategy 4: Fuzzy match on title (for user-friendly URLs)
             if title:
                 title_normalized = title.lower().replace(' ', '')
-                filename_normalized = page_filename_noext.replace(' ', '').replace('_', '')
                 if title_normalized in filename_normalized or filename_normalized in title_normalized:
                     print(f"[DEBUG] ✓ Matched by title: {title}")
                     return page
@@ -183,14 +202,49 @@ class SharePointPageCrawler:
             print(f"[ERROR] Failed to get page content: {e}")
             return None
     
+    def _get_page_content_cached(self, site_id: str, page_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get page content, reusing the cached copy if the page hasn't been modified since."""
+        page_id = page_info.get('id')
+        last_modified = page_info.get('lastModifiedDateTime')
+        cache = self._page_cache
+        
+        if cache is not None and last_modified:
+            cached = cache.get(page_id)
+            if cached and cached[0] == last_modified:
+                self.stats['pages_from_cache'] += 1
+                return cached[1]
+        
+        page_data = self._get_page_content(site_id, page_id)
+        if page_data and cache is not None and last_modified:
+            cache[page_id] = (last_modified, page_data)
+        return page_data
+    
+    def _normalize_page_link(self, href: str) -> Optional[str]:
+        """Absolute URL for an href to a page on this site, None for any other href."""
+        # Decode URL-encoded links
+        link = unquote(href)
+        
+        # Check if it's a SharePoint page
+        if 'SitePages' not in link or 'aspx' not in link:
+            return None
+        
+        # Make absolute if relative
+        if not link.startswith('http'):
+            link = urljoin(self.site_url, link)
+        
+        # Only include links from the same site
+        return link if self.hostname in link else None
+    
     def _extract_links_from_page(self, page_data: Dict[str, Any]) -> List[str]:
         """Extract links from page content."""
-        links = []
-        
         try:
             # Extract from canvasLayout (webParts)
             canvas_layout = page_data.get('canvasLayout', {})
             
+            # Raw hrefs go straight into a set, so a link repeated across
+            # webparts is only decoded and resolved once below
+            hrefs = set()
+            
             # Horizontal sections
             horizontal_sections = canvas_layout.get('horizontalSections', [])
             for section in horizontal_sections:
@@ -198,42 +252,20 @@ class SharePointPageCrawler:
                 for column in columns:
                     webparts = column.get('webparts', [])
                     for webpart in webparts:
-                        # Extract links from webpart content
-                        inner_html = webpart.get('innerHtml', '')
-                        
-                        # Find href attributes
-                        href_pattern = r'href=["\']([^"\']+)["\']'
-                        matches = re.findall(href_pattern, inner_html)
-                        links.extend(matches)
+                        # Find href attributes in webpart content
+                        hrefs.update(HREF_PATTERN.findall(webpart.get('innerHtml', '')))
             
             # Vertical sections
             vertical_section = canvas_layout.get('verticalSection', {})
             if vertical_section:
                 webparts = vertical_section.get('webparts', [])
                 for webpart in webparts:
-                    inner_html = webpart.get('innerHtml', '')
-                    href_pattern = r'href=["\']([^"\']+)["\']'
-                    matches = re.findall(href_pattern, inner_html)
-                    links.extend(matches)
-            
-            # Filter to SharePoint pages only
-            sharepoint_links = []
-            for link in links:
-                # Decode URL-encoded links
-                link = unquote(link)
-                
-                # Check if it's a SharePoint page
-                if 'SitePages' in link and (link.endswith('.aspx') or 'aspx' in link):
-                    # Make absolute if relative
-                    if not link.startswith('http'):
-                        link = urljoin(self.site_url, link)
-                    
-                    # Only include links from the same site
-                    if self.hostname in link:
-                        sharepoint_links.append(link)
-            
-            # Remove duplicates
-            sharepoint_links = list(set(sharepoint_links))
+                    hrefs.update(HREF_PATTERN.findall(webpart.get('innerHtml', '')))
+            
+            # Filter to SharePoint pages only (the set also removes duplicates)
+            sharepoint_links = list({
+                link for href in hrefs if (link := self._normalize_page_link(href))
+            })
             
             self.stats['links_found'] += len(sharepoint_links)
             
@@ -288,28 +320,14 @@ class SharePointPageCrawler:
             print(f"[ERROR] Failed to create document: {e}")
             return None
     
-    def _crawl_page_recursive(
-        self, 
+    def _crawl_page(
+        self,
         site_id: str,
         all_pages: List[Dict[str, Any]],
         page_url: str,
-        depth: int = 0
-    ) -> List[Document]:
-        """Recursively crawl a page and its linked pages."""
-        documents = []
-        
-        # Check depth limit
-        if depth > self.max_depth:
-            return documents
-        
-        # Check if already visited
-        if page_url in self.visited_pages:
-            self.stats['pages_skipped'] += 1
-            return documents
-        
-        # Mark as visited
-        self.visited_pages.add(page_url)
-        
+        depth: int
+    ) -> Tuple[Optional[Document], List[str]]:
+        """Crawl a single page and return its document (if any) and the page links on it."""
         print(f"\n[*] Crawling page (depth {depth}): {page_url}")
         
         try:
@@ -322,16 +340,14 @@ class SharePointPageCrawler:
             
             if not page_info:
                 print(f"[WARNING] Could not find page in site: {page_path}")
-                return documents
-            
-            page_id = page_info.get('id')
+                return None, []
             
-            # Get page content
-            page_data = self._get_page_content(site_id, page_id)
+            # Get page content (skips the request for unchanged pages)
+            page_data = self._get_page_content_cached(site_id, page_info)
             
             if not page_data:
                 print(f"[WARNING] Could not get page content")
-                return documents
+                return None, []
             
             # Parse page content using the parser
             from app.sharepoint_page_parser import SharePointPageParser
@@ -339,12 +355,12 @@ class SharePointPageCrawler:
             
             page_content_text = parser.parse_page_content(page_data)
             
+            doc = None
             if page_content_text and page_content_text.strip():
                 # Create document
                 doc = self._create_document_from_page(page_data, page_content_text)
                 
                 if doc:
-                    documents.append(doc)
                     self.stats['pages_crawled'] += 1
                     print(f"[OK] Extracted page: {page_data.get('title', 'Untitled')} ({len(page_content_text)} chars)")
             
@@ -354,16 +370,50 @@ class SharePointPageCrawler:
             if links:
                 print(f"[*] Found {len(links)} links on this page")
             
-            # Recursively crawl linked pages
-            for link in links:
-                if link not in self.visited_pages:
-                    child_docs = self._crawl_page_recursive(site_id, all_pages, link, depth + 1)
-                    documents.extend(child_docs)
+            return doc, links
             
         except Exception as e:
             error_msg = f"Failed to crawl page {page_url}: {e}"
             print(f"[ERROR] {error_msg}")
             self.stats['errors'].append(error_msg)
+            return None, []
+    
+    def _crawl_pages(
+        self,
+        site_id: str,
+        all_pages: List[Dict[str, Any]],
+        start_url: str
+    ) -> List[Document]:
+        """
+        Crawl breadth-first from start_url, following links down to max_depth.
+        
+        Each page is reached at its shallowest depth, so a page first linked
+        from deep in the tree no longer has its own links cut off early.
+        """
+        documents = []
+        pending = deque([(start_url, 0)])
+        
+        while pending:
+            page_url, depth = pending.popleft()
+            
+            # Check depth limit
+            if depth > self.max_depth:
+                continue
+            
+            # Check if already visited
+            if page_url in self.visited_pages:
+                self.stats['pages_skipped'] += 1
+                continue
+            
+            # Mark as visited
+            self.visited_pages.add(page_url)
+            
+            doc, links = self._crawl_page(site_id, all_pages, page_url, depth)
+            if doc:
+                documents.append(doc)
+            
+            # Queue linked pages for the next level
+            pending.extend((link, depth + 1) for link in links if link not in self.visited_pages)
         
         return documents
     
@@ -401,8 +451,14 @@ class SharePointPageCrawler:
         
         print(f"\n[*] Starting crawl from: {start_url}")
         
-        # Crawl pages recursively
-        documents = self._crawl_page_recursive(site_id, all_pages, start_url, depth=0)
+        # Crawl pages breadth-first
+        os.makedirs(os.path.dirname(PAGE_CACHE_PATH), exist_ok=True)
+        with shelve.open(PAGE_CACHE_PATH) as page_cache:
+            self._page_cache = page_cache
+            try:
+                documents = self._crawl_pages(site_id, all_pages, start_url)
+            finally:
+                self._page_cache = None
         
         # Print summary
         print("\n" + "=" * 70)
@@ -410,6 +466,7 @@ class SharePointPageCrawler:
         print("=" * 70)
         print(f"Pages crawled: {self.stats['pages_crawled']}")
         print(f"Pages skipped: {self.stats['pages_skipped']}")
+        print(f"Pages unchanged (from cache): {self.stats['pages_from_cache']}")
         print(f"Links found: {self.stats['links_found']}")
         print(f"Documents created: {len(documents)}")
         print(f"Errors: {len(self.stats['errors'])}")
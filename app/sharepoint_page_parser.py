@@ -11,6 +11,9 @@ import html
 from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup
 
+# Pattern to match URLs
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
 
 class SharePointPageParser:
     """Parses SharePoint page content from Graph API responses."""
@@ -243,10 +246,7 @@ class SharePointPageParser:
         links = []
         
         try:
-            # Pattern to match URLs
-            url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-            
-            matches = re.findall(url_pattern, content)
+            matches = URL_PATTERN.findall(content)
             links.extend(matches)
             
             # Remove duplicates
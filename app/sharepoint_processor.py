@@ -15,6 +15,7 @@ from urllib.parse import urljoin, urlparse, unquote
 from bs4 import BeautifulSoup
 from datetime import datetime
 import json
+from collections import Counter
 
 from app.sharepoint_auth import sharepoint_auth
 from app.sharepoint_models import (
@@ -377,12 +378,13 @@ class SharePointProcessor:
             # Calculate results
             duration = time.time() - start_time
             total_content_length = sum(len(doc.page_content) for doc in all_documents)
+            content_types = Counter(d.metadata.get('content_type') for d in all_documents)
             
             result = SharePointCrawlResult(
                 pages_crawled=len(self.crawled_urls),
                 pages_failed=len(self.failed_urls),
-                faqs_extracted=len([d for d in all_documents if d.metadata.get('content_type') == 'faq']),
-                tables_extracted=len([d for d in all_documents if d.metadata.get('content_type') == 'table']),
+                faqs_extracted=content_types['faq'],
+                tables_extracted=content_types['table'],
                 total_content_length=total_content_length,
                 crawl_duration=duration
             )
@@ -7,6 +7,7 @@ Microsoft Graph API doesn't provide page content directly.
 """
 
 import os
+import re
 import requests
 from typing import List, Dict, Any, Optional, Set
 from urllib.parse import urljoin, urlparse
@@ -17,6 +18,9 @@ from app.sharepoint_auth import sharepoint_auth
 from app.sharepoint_models import SharePointFAQ, SharePointTable, SharePointMetadata
 from langchain_core.documents import Document
 
+# A SharePoint site page, matched in one scan rather than two substring checks
+SITE_PAGE_HREF = re.compile(r'sharepoint\.com.*/SitePages/')
+
 class SharePointWebScraper:
     """Scrapes SharePoint pages to extract content."""
     
@@ -76,6 +80,7 @@ class SharePointWebScraper:
     def find_child_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Find all SharePoint links on the page."""
         links = []
+        seen = set()
         
         # Find all anchor tags
         for link in soup.find_all('a', href=True):
@@ -84,18 +89,20 @@ class SharePointWebScraper:
             if not href:
                 continue
             
-            # Convert relative URLs to absolute
-            if href.startswith('/'):
-                href = urljoin(base_url, href)
-            elif href.startswith('http'):
+            if href.startswith('http'):
                 # Only include SharePoint links
-                if 'sharepoint.com' in href:
-                    links.append(href)
-            
-            # Check if it's a SharePoint page
-            if 'sharepoint.com' in href and '/SitePages/' in href:
-                if href not in links:
-                    links.append(href)
+                keep = 'sharepoint.com' in href
+            else:
+                # Convert relative URLs to absolute; these are kept only if
+                # they point at a SharePoint page
+                if href.startswith('/'):
+                    href = urljoin(base_url, href)
+                keep = SITE_PAGE_HREF.search(href) is not None
+            
+            # The seen set replaces an O(n) 'not in links' scan per anchor
+            if keep and href not in seen:
+                seen.add(href)
+                links.append(href)
         
         return links
     
@@ -6,11 +6,18 @@ Uses Selenium browser automation to extract SharePoint page content.
 This is the most reliable automated approach.
 """
 
+import json
 import os
+import queue
+import threading
 import time
-from typing import List, Optional, Set
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import List, Optional, Set, Tuple
+from urllib.parse import quote, unquote, urljoin, urlparse, urlsplit
+import requests
+import soupsieve
+from bs4 import BeautifulSoup, Tag
 from langchain_core.documents import Document
 
 # Import Selenium components
@@ -21,10 +28,77 @@ try:
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
 
+# lxml builds the soup in C and is several times faster than html.parser on
+# full SharePoint page sources; fall back when it isn't installed
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Link discovery only needs anchor hrefs, so they are read in the browser
+# rather than by copying out and parsing the whole page source again
+SITEPAGE_HREFS_JS = (
+    "return Array.from(document.querySelectorAll('a[href*=\"SitePages\"]'), "
+    "a => a.getAttribute('href'));"
+)
+
+# SharePoint chrome text dropped from extracted pages (substring match per line)
+SKIP_PHRASES = (
+    'Skip Ribbon Commands',
+    'Skip to main content',
+    'Turn on more accessible mode',
+    'Turn off more accessible mode',
+    'enable scripts and reload',
+    'secured browser on the server',
+    'To navigate through the Ribbon',
+    'Sign in',
+    'Laxman Kadari',  # User-specific
+)
+
+# Containers of a page's client-side content. SharePoint mounts them before the
+# web parts inside hydrate, so readiness means one of them has text, not just exists
+CONTENT_READY_SELECTOR = (
+    "div[class*='CanvasZone'], [data-automation-id='contentScrollRegion'], "
+    "div[class*='mainContent'], div[role='main'], article"
+)
+PAGE_LOAD_TIMEOUT = 10
+# Pages with none of those containers (lists, classic pages) stop waiting after this
+CONTENT_CONTAINER_TIMEOUT = 2
+
+# Longest text among the innermost matching containers, or -1 if none is mounted yet
+CONTENT_TEXT_LENGTH_JS = """
+const els = Array.from(document.querySelectorAll(arguments[0]));
+if (!els.length) return -1;
+const innermost = els.filter(e => !els.some(o => o !== e && e.contains(o)));
+return Math.max(...innermost.map(e => (e.innerText || '').trim().length));
+"""
+
+# Resources the crawl never reads; blocked once signed in to cut bytes per page.
+# Stylesheets are left alone - SharePoint's virtualized lists need layout to render
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp",
+    "*.woff", "*.woff2", "*.ttf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+]
+
+# Elements stripped from the content area before its text is taken. The CSS is
+# compiled once here and matched in a single select() pass per page
+NON_CONTENT_SELECTOR = soupsieve.compile(
+    'script, style, nav, header, footer, button, '
+    '[class*="CommandBar"], [class*="Ribbon"], [class*="SuiteNav"]'
+)
+
+# SharePoint chrome removed when falling back to the whole <body>
+PAGE_CHROME_SELECTOR = soupsieve.compile(
+    '[class*="ribbon"], [class*="navigation"], [class*="commandBar"], [class*="nav-"], nav, header'
+)
+
 class SharePointSeleniumExtractor:
     """Extract SharePoint content using Selenium browser automation."""
     
@@ -32,20 +106,34 @@ class SharePointSeleniumExtractor:
         self.site_url = os.getenv("SHAREPOINT_SITE_URL", "https://cloudfuzecom.sharepoint.com/sites/DOC360")
         self.start_page = os.getenv("SHAREPOINT_START_PAGE", "/SitePages/Multi%20User%20Golden%20Image%20Combinations.aspx")
         self.max_depth = int(os.getenv("SHAREPOINT_MAX_DEPTH", "3"))
+        # Browsers crawling in parallel after sign-in (1 = only the sign-in browser)
+        self.workers = max(1, int(os.getenv("SHAREPOINT_SELENIUM_WORKERS", "4")))
+        # Opt-in: fetch modern pages through the REST API with the browser's session,
+        # rendering in the browser only when REST can't serve the page. Faster, but
+        # it only sees text web parts and misses navigation/quick-links
+        self.use_rest = os.getenv("SHAREPOINT_SELENIUM_USE_REST", "false").lower() == "true"
         self.crawled_urls: Set[str] = set()
         
         print(f"[*] SharePoint Selenium Extractor initialized")
         print(f"   Site: {self.site_url}")
     
-    def setup_driver(self):
+    def setup_driver(self, headless: bool = False):
         """Setup Chrome WebDriver with options."""
         if not SELENIUM_AVAILABLE:
             raise ImportError("Selenium not installed. Run: pip install selenium webdriver-manager")
         
         chrome_options = Options()
         
-        # Run in visible mode (not headless) so user can see and interact
-        # chrome_options.add_argument('--headless')  # Commented out for user interaction
+        # The sign-in browser runs visible so the user can see and interact;
+        # crawl workers reuse its session and don't need a window or images
+        if headless:
+            chrome_options.add_argument('--headless=new')
+            chrome_options.add_argument('--disable-gpu')
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.managed_default_content_settings.media_stream": 2,
+            })
         
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
@@ -67,110 +155,276 @@ class SharePointSeleniumExtractor:
         
         return driver
     
+    def clone_authenticated_driver(self, source_driver):
+        """Start a headless browser carrying source_driver's SharePoint session cookies."""
+        driver = self.setup_driver(headless=True)
+        cookies = []
+        for cookie in source_driver.get_cookies():
+            cdp_cookie = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite") if key in cookie}
+            if "expiry" in cookie:
+                cdp_cookie["expires"] = cookie["expiry"]
+            cookies.append(cdp_cookie)
+        # Set through CDP so cookies for any domain can be added before the first navigation
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        self.block_heavy_resources(driver)
+        return driver
+    
+    @staticmethod
+    def block_heavy_resources(driver):
+        """Stop the browser fetching images, fonts and media (text extraction never uses them)."""
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"[INFO] Could not block images/fonts/media: {e}")
+    
+    def start_crawl_drivers(self, signed_in_driver) -> list:
+        """Return the browsers to crawl with: the signed-in one plus headless clones."""
+        drivers = [signed_in_driver]
+        for _ in range(self.workers - 1):
+            try:
+                drivers.append(self.clone_authenticated_driver(signed_in_driver))
+            except Exception as e:
+                print(f"[INFO] Could not start another crawl browser: {e}")
+                break
+        print(f"[*] Crawling with {len(drivers)} browser(s)")
+        return drivers
+    
+    @staticmethod
+    def wait_for_page(driver, content_selector: Optional[str] = CONTENT_READY_SELECTOR,
+                      timeout: int = PAGE_LOAD_TIMEOUT) -> bool:
+        """
+        Wait until the page has loaded instead of sleeping a fixed time.
+        
+        Returns once document.readyState is "complete" and, when a
+        content_selector is given, a matching container has rendered text
+        (modern pages fill their canvas after the document itself loads).
+        Pages where no container appears within CONTENT_CONTAINER_TIMEOUT are
+        taken as they are. Returns False on timeout; callers go on and extract
+        whatever has rendered.
+        """
+        wait = WebDriverWait(driver, timeout, poll_frequency=0.25)
+        try:
+            wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+            if content_selector:
+                loaded_at = time.monotonic()
+                
+                def content_rendered(d):
+                    text_length = d.execute_script(CONTENT_TEXT_LENGTH_JS, content_selector)
+                    if text_length > 0:
+                        return True
+                    # No content container at all: not a modern page, nothing more to wait for
+                    return text_length < 0 and time.monotonic() - loaded_at >= CONTENT_CONTAINER_TIMEOUT
+                
+                wait.until(content_rendered)
+            return True
+        except TimeoutException:
+            print(f"   [WARNING] Page not ready after {timeout}s, continuing")
+            return False
+    
+    @staticmethod
+    def _on_login_page(driver) -> bool:
+        """Whether the browser is still on a sign-in page."""
+        # current_url is a WebDriver round trip; fetch and lowercase it once per check
+        current_url = driver.current_url.lower()
+        return "login" in current_url or "signin" in current_url
+    
+    @staticmethod
+    def _find_main_content(soup):
+        """
+        Locate the page's content area in one walk over the tree.
+        
+        Candidates, in priority order: the modern canvas zone, the
+        contentScrollRegion wrapper, a mainContent div, the role="main" div,
+        then the first <article>. The walk stops as soon as the top-priority
+        match is seen; otherwise the best match found is returned.
+        """
+        candidates = [None] * 5
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            if element.name == 'div':
+                classes = ' '.join(element.get('class') or ())
+                if candidates[0] is None and 'CanvasZone' in classes:
+                    candidates[0] = element
+                    break
+                if candidates[1] is None and element.get('data-automation-id') == 'contentScrollRegion':
+                    candidates[1] = element
+                if candidates[2] is None and 'mainContent' in classes:
+                    candidates[2] = element
+                if candidates[3] is None and element.get('role') == 'main':
+                    candidates[3] = element
+            elif element.name == 'article' and candidates[4] is None:
+                candidates[4] = element
+        return next((c for c in candidates if c is not None), None)
+    
     def extract_page_content(self, driver) -> str:
         """Extract content from current page."""
         page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'html.parser')
+        soup = BeautifulSoup(page_source, HTML_PARSER)
         
         # SharePoint Modern Page - Try multiple selectors for content area
-        main_content = None
-        
-        # Priority 1: Modern SharePoint page content canvas
-        main_content = soup.find('div', {'class': lambda x: x and 'CanvasZone' in x})
-        
-        if not main_content:
-            # Priority 2: Page content wrapper
-            main_content = soup.find('div', {'data-automation-id': 'contentScrollRegion'})
-        
-        if not main_content:
-            # Priority 3: Main canvas section
-            main_content = soup.find('div', {'class': lambda x: x and 'mainContent' in x})
-        
-        if not main_content:
-            # Priority 4: Try to find the canvas element
-            main_content = soup.find('div', {'role': 'main'})
-        
-        if not main_content:
-            # Priority 5: Look for the article element
-            main_content = soup.find('article')
+        main_content = self._find_main_content(soup)
         
         if not main_content:
             # Fallback: Get the body but remove navigation
             main_content = soup.find('body')
             if main_content:
                 # Remove SharePoint chrome elements
-                for unwanted in main_content.select('[class*="ribbon"], [class*="navigation"], [class*="commandBar"], [class*="nav-"], nav, header'):
+                for unwanted in PAGE_CHROME_SELECTOR.select(main_content):
                     unwanted.decompose()
         
         if main_content:
-            # Remove unwanted elements
-            for script in main_content(["script", "style", "nav", "header", "footer", "button"]):
-                script.decompose()
-            
-            # Remove specific SharePoint UI elements
-            for element in main_content.select('[class*="CommandBar"], [class*="Ribbon"], [class*="SuiteNav"]'):
-                element.decompose()
-            
-            # Get text content
-            text_content = main_content.get_text(separator='\n', strip=True)
-            
-            # Clean up - remove common SharePoint UI text
-            skip_phrases = [
-                'Skip Ribbon Commands',
-                'Skip to main content',
-                'Turn on more accessible mode',
-                'Turn off more accessible mode',
-                'enable scripts and reload',
-                'secured browser on the server',
-                'To navigate through the Ribbon',
-                'Sign in',
-                'Laxman Kadari'  # User-specific
-            ]
-            
-            lines = []
-            for line in text_content.splitlines():
-                line = line.strip()
-                # Skip empty lines and SharePoint UI text
-                if line and not any(phrase in line for phrase in skip_phrases):
-                    lines.append(line)
-            
-            cleaned_content = '\n'.join(lines)
-            
-            # If content is too short (likely failed extraction), return empty
-            if len(cleaned_content) < 100:
-                print(f"[WARNING] Extracted content too short ({len(cleaned_content)} chars), likely incomplete")
-                return ""
-            
-            return cleaned_content
+            return self._content_text(main_content)
         
         return ""
     
+    @staticmethod
+    def _content_text(main_content) -> str:
+        """Cleaned text of a page's content element ("" if too short to be real content)."""
+        # Remove unwanted elements and specific SharePoint UI elements
+        for element in NON_CONTENT_SELECTOR.select(main_content):
+            element.decompose()
+        
+        # Get text content
+        text_content = main_content.get_text(separator='\n', strip=True)
+        
+        # Clean up - remove common SharePoint UI text
+        lines = []
+        for line in text_content.splitlines():
+            line = line.strip()
+            # Skip empty lines and SharePoint UI text
+            if line and not any(phrase in line for phrase in SKIP_PHRASES):
+                lines.append(line)
+        
+        cleaned_content = '\n'.join(lines)
+        
+        # If content is too short (likely failed extraction), return empty
+        if len(cleaned_content) < 100:
+            print(f"[WARNING] Extracted content too short ({len(cleaned_content)} chars), likely incomplete")
+            return ""
+        
+        return cleaned_content
+    
     def find_sharepoint_links(self, driver) -> List[str]:
         """Find all SharePoint page links on current page."""
         try:
-            page_source = driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            links = []
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '')
-                # Look for SitePages links
-                if 'SitePages' in href:
-                    # Extract the path component
-                    if href.startswith('/'):
-                        links.append(href)
-                    elif 'sharepoint.com' in href:
-                        # Extract just the path from full URL
-                        from urllib.parse import urlparse
-                        parsed = urlparse(href)
-                        links.append(parsed.path)
-            
-            # Remove duplicates
-            return list(set(links))
+            return self._sitepage_links(driver.execute_script(SITEPAGE_HREFS_JS) or [])
         except Exception as e:
             print(f"[ERROR] Failed to find links: {e}")
             return []
     
+    @staticmethod
+    def _sitepage_links(hrefs) -> List[str]:
+        """Paths of the SitePages links among hrefs, deduplicated."""
+        paths = set()
+        for href in hrefs:
+            # Look for SitePages links, site-relative or on SharePoint
+            if href and 'SitePages' in href and (href.startswith('/') or 'sharepoint.com' in href):
+                # Keep just the path (relative links used to keep their
+                # ?query/#fragment, so one page could be crawled several times)
+                path = urlsplit(href).path
+                if 'SitePages' in path:
+                    paths.add(path)
+        
+        return list(paths)
+    
+    @staticmethod
+    def rest_session_from_cookies(cookies) -> requests.Session:
+        """A requests session authenticated with browser cookies for SharePoint (FedAuth/rtFa)."""
+        session = requests.Session()
+        for cookie in cookies:
+            session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+        session.headers.update({"Accept": "application/json;odata=nometadata"})
+        return session
+    
+    def crawl_page_via_rest(self, session: requests.Session, url: str, depth: int) -> Optional[Tuple[Optional[Document], List[str]]]:
+        """
+        Fetch a modern page's title and canvas through the SharePoint REST API.
+        
+        Returns the same (document, links) pair as crawl_page, or None when the
+        page can't be served this way (outside the site, not a modern page, or
+        the request is refused) so the caller falls back to the browser.
+        """
+        site_path = unquote(urlparse(self.site_url).path).rstrip('/') + '/'
+        page_path = unquote(urlparse(url).path)
+        if not page_path.startswith(site_path):
+            return None
+        relative_url = page_path[len(site_path):].replace("'", "''")
+        
+        response = session.get(
+            f"{self.site_url}/_api/sitepages/pages/GetByUrl('{quote(relative_url)}')",
+            params={"$select": "Title,CanvasContent1"},
+            timeout=30,
+        )
+        if response.status_code in (401, 403):
+            # The browser session isn't accepted by REST; stop trying it
+            print(f"[INFO] SharePoint REST refused ({response.status_code}), using the browser for all pages")
+            self.use_rest = False
+            return None
+        if response.status_code != 200:
+            return None
+        
+        page = response.json()
+        canvas = page.get("CanvasContent1")
+        if not canvas:
+            return None
+        
+        # The canvas is a JSON list of web parts; text web parts carry their HTML in innerHTML
+        canvas_html = "\n".join(part.get("innerHTML", "") for part in json.loads(canvas) if isinstance(part, dict))
+        soup = BeautifulSoup(canvas_html, HTML_PARSER)
+        links = []
+        if depth < self.max_depth:
+            hrefs = (anchor.get('href', '') for anchor in soup.find_all('a', href=True))
+            links = [urljoin(url, link) if not link.startswith('http') else link for link in self._sitepage_links(hrefs)]
+        content = self._content_text(soup)
+        
+        print(f"   Fetched via REST: {url}")
+        doc = None
+        if content:
+            doc = self._page_document(content, page.get("Title") or "", url, depth)
+            print(f"   ✅ Extracted ({len(content)} chars)")
+        return doc, links
+    
+    @staticmethod
+    def _page_document(content: str, page_title: str, url: str, depth: int) -> Document:
+        """Build the Document for one crawled page."""
+        return Document(
+            page_content=content[:15000],
+            metadata={
+                "source_type": "sharepoint",
+                "source": "cloudfuze_doc360",
+                "page_title": page_title,
+                "page_url": url,
+                "content_type": "sharepoint_page",
+                "depth": depth
+            }
+        )
+    
+    def crawl_page(self, driver, url: str, depth: int) -> Tuple[Optional[Document], List[str]]:
+        """Load one page and return its document (if any) and the links found on it."""
+        print(f"   Crawling: {url}")
+        driver.get(url)
+        self.wait_for_page(driver)
+        
+        # Extract content
+        page_title = driver.title
+        content = self.extract_page_content(driver)
+        
+        doc = None
+        if content:
+            doc = self._page_document(content, page_title, url, depth)
+            print(f"   ✅ Extracted ({len(content)} chars)")
+        
+        # Find links for next depth
+        links = []
+        if depth < self.max_depth:
+            links = self.find_sharepoint_links(driver)
+            # Make sure links are absolute URLs
+            links = [urljoin(url, link) if not link.startswith('http') else link for link in links]
+        return doc, links
+    
     def extract_all_pages(self) -> List[Document]:
         """Extract content from all SharePoint pages."""
         print("=" * 60)
@@ -184,6 +438,7 @@ class SharePointSeleniumExtractor:
         
         all_documents = []
         driver = None
+        drivers = []
         
         try:
             # Setup driver
@@ -194,8 +449,8 @@ class SharePointSeleniumExtractor:
             print(f"[*] Navigating to: {full_url}")
             driver.get(full_url)
             
-            # Wait for page to load
-            time.sleep(3)
+            # Wait for the document (or the sign-in redirect) to finish loading
+            self.wait_for_page(driver, content_selector=None)
             
             # Check if we need authentication
             current_url = driver.current_url
@@ -213,14 +468,14 @@ class SharePointSeleniumExtractor:
                 
                 # Wait for authentication (max 5 minutes)
                 wait_time = 0
-                while ("login" in driver.current_url.lower() or "signin" in driver.current_url.lower()) and wait_time < 300:
+                while self._on_login_page(driver) and wait_time < 300:
                     time.sleep(2)
                     wait_time += 2
                     if wait_time % 30 == 0:
                         print(f"   Still waiting... ({wait_time // 60} min {wait_time % 60} sec)")
                     driver.switch_to.window(driver.window_handles[0])
                 
-                if "login" in driver.current_url.lower() or "signin" in driver.current_url.lower():
+                if self._on_login_page(driver):
                     print("\n[ERROR] Authentication timeout - please sign in faster next time")
                     return []
                 else:
@@ -228,59 +483,64 @@ class SharePointSeleniumExtractor:
             
             print("[OK] Ready to extract content")
             
+            # Sign-in is done, so the visible browser can drop images/fonts too
+            self.block_heavy_resources(driver)
+            
             # Start with the current page
-            all_urls = [driver.current_url]
+            # URLs for the next level, as an ordered set: the nav links repeated on
+            # every page are held once instead of once per page that links to them
+            all_urls = dict.fromkeys([driver.current_url])
             depth = 0
             
-            while depth <= self.max_depth and len(all_urls) > 0:
-                current_batch = list(all_urls)
-                all_urls = []
-                
-                print(f"\n[*] Depth {depth}: Processing {len(current_batch)} pages")
-                
-                for url in current_batch:
-                    if url in self.crawled_urls:
-                        continue
-                    
+            # Pages of one depth are independent, so each level is spread across
+            # the browsers; a browser is checked out of the pool per page
+            drivers = self.start_crawl_drivers(driver)
+            driver_pool = queue.Queue()
+            for pooled in drivers:
+                driver_pool.put(pooled)
+            
+            # requests.Session isn't thread-safe, so each crawl thread builds its own
+            # from one snapshot of the signed-in browser's cookies
+            session_cookies = driver.get_cookies() if self.use_rest else []
+            rest_sessions = threading.local()
+            
+            def crawl_with_pooled_driver(url, page_depth):
+                if self.use_rest:
                     try:
-                        print(f"   Crawling: {url}")
-                        driver.get(url)
-                        time.sleep(2)  # Wait for page load
-                        
-                        # Extract content
-                        page_title = driver.title
-                        content = self.extract_page_content(driver)
-                        
-                        if content:
-                            doc = Document(
-                                page_content=content[:15000],
-                                metadata={
-                                    "source_type": "sharepoint",
-                                    "source": "cloudfuze_doc360",
-                                    "page_title": page_title,
-                                    "page_url": url,
-                                    "content_type": "sharepoint_page",
-                                    "depth": depth
-                                }
-                            )
+                        if not hasattr(rest_sessions, "session"):
+                            rest_sessions.session = self.rest_session_from_cookies(session_cookies)
+                        result = self.crawl_page_via_rest(rest_sessions.session, url, page_depth)
+                        if result is not None:
+                            return result
+                    except Exception as e:
+                        print(f"   [INFO] REST fetch failed for {url}: {e}")
+                pooled = driver_pool.get()
+                try:
+                    return self.crawl_page(pooled, url, page_depth)
+                except Exception as e:
+                    print(f"   ⚠️ Error: {e}")
+                    return None
+                finally:
+                    driver_pool.put(pooled)
+            
+            with ThreadPoolExecutor(max_workers=len(drivers)) as pool:
+                while depth <= self.max_depth and len(all_urls) > 0:
+                    current_batch = [url for url in all_urls if url not in self.crawled_urls]
+                    all_urls = {}
+                    
+                    print(f"\n[*] Depth {depth}: Processing {len(current_batch)} pages")
+                    
+                    for url, result in zip(current_batch, pool.map(crawl_with_pooled_driver, current_batch, repeat(depth))):
+                        if result is None:
+                            continue
+                        doc, links = result
+                        if doc:
                             all_documents.append(doc)
-                            print(f"   ✅ Extracted ({len(content)} chars)")
-                        
                         self.crawled_urls.add(url)
-                        
-                        # Find links for next depth
-                        if depth < self.max_depth:
-                            links = self.find_sharepoint_links(driver)
-                            # Make sure links are absolute URLs and filter out already crawled
-                            links = [urljoin(url, link) if not link.startswith('http') else link for link in links]
-                            links = [link for link in links if link not in self.crawled_urls]
-                            all_urls.extend(links)  # Get ALL links, not just 5
-                        
-                    except Exception as e:
-                        print(f"   ⚠️ Error: {e}")
-                        continue
-                
-                depth += 1
+                        # Get ALL links, not just 5
+                        all_urls.update((link, None) for link in links if link not in self.crawled_urls)
+                    
+                    depth += 1
             
             print(f"\n[OK] Extraction complete!")
             print(f"   Pages crawled: {len(self.crawled_urls)}")
@@ -295,6 +555,11 @@ class SharePointSeleniumExtractor:
             return []
         
         finally:
+            for extra in drivers[1:]:
+                try:
+                    extra.quit()
+                except Exception:
+                    pass
             if driver:
                 print("[*] Closing browser...")
                 driver.quit()
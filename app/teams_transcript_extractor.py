@@ -14,6 +14,9 @@ from app.sharepoint_auth import sharepoint_auth
 from urllib.parse import urlparse
 import os
 
+# VTT header/comment lines, skipped with a single tuple startswith per line
+VTT_SKIP_PREFIXES = ('WEBVTT', 'NOTE')
+
 
 class TeamsTranscriptExtractor:
     """Extract transcripts from Teams meetings."""
@@ -112,10 +115,9 @@ class TeamsTranscriptExtractor:
             line = line.strip()
             # Skip VTT headers, timestamps, and empty lines
             if (
-                line.startswith('WEBVTT') or
-                line.startswith('NOTE') or
+                not line or
+                line.startswith(VTT_SKIP_PREFIXES) or
                 '-->' in line or
-                line == '' or
                 line.isdigit()
             ):
                 continue
@@ -1,4 +1,4 @@
-from app.helpers import build_vectorstore, build_combined_vectorstore
+from app.helpers import build_vectorstore, build_combined_vectorstore, get_embeddings
 from app.pdf_processor import process_pdf_directory, chunk_pdf_documents
 from config import (
     CHROMA_DB_PATH, INITIALIZE_VECTORSTORE,
@@ -7,14 +7,30 @@ from config import (
     SHAREPOINT_SITE_URL, SHAREPOINT_START_PAGE,
     ENABLE_TEAMS_TRANSCRIPTS, TEAMS_TRANSCRIPT_DAYS_BACK,
     VECTORSTORE_BACKEND, MONGODB_VECTORSTORE_COLLECTION,
+    VECTORSTORE_METADATA_PRETTY,
 )
 import os
 import shutil
+import glob
+import subprocess
 import json
 import hashlib
+import functools
+import asyncio
+import threading
+import time
+import copy
 from datetime import datetime
-from langchain_openai import OpenAIEmbeddings
+from concurrent.futures import ThreadPoolExecutor
 from langchain_chroma import Chroma
+from app.document_bloom import load_or_build_bloom, skip_indexed_documents, reset_bloom
+
+# Use orjson for the metadata file when available (much faster on large per-file hash maps)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Import MongoDB vector store if backend is set to MongoDB
 if VECTORSTORE_BACKEND == "mongodb":
@@ -31,35 +47,139 @@ else:
 
 METADATA_FILE = "./data/vectorstore_metadata.json"
 
+# Read size for streaming file hashes (keeps memory flat for large Excel/PDF files)
+HASH_BUFFER_SIZE = 8 * 1024 * 1024
+
 def get_file_hash(file_path):
     """Get MD5 hash of a file for change detection."""
     try:
-        with open(file_path, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
+        file_hash = hashlib.md5()
+        with open(file_path, 'rb', buffering=0) as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            while chunk := f.read(HASH_BUFFER_SIZE):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
     except:
         return None
 
-def get_directory_hash(directory):
-    """Get combined hash of all files in a directory."""
-    if not os.path.exists(directory):
-        return None
-    
-    hashes = []
-    for root, dirs, files in os.walk(directory):
-        for file in files:
+def _compute_directory_snapshot(directory):
+    """Walk a directory and hash every file, keyed by path relative to the directory."""
+    files = {}
+    for root, dirs, filenames in os.walk(directory):
+        for file in filenames:
             file_path = os.path.join(root, file)
             file_hash = get_file_hash(file_path)
             if file_hash:
-                hashes.append(f"{file_path}:{file_hash}")
+                files[os.path.relpath(file_path, directory)] = file_hash
     
-    if not hashes:
+    if not files:
+        return None
+    
+    return {"root": _combine_file_hashes(files), "files": files}
+
+def _combine_file_hashes(files):
+    """Hash sorted (path, hash) pairs incrementally instead of joining one big string.
+    
+    Produces the same digest as md5("|".join(f"{path}:{hash}" ...)).
+    """
+    combined = hashlib.md5()
+    separator = b""
+    for path, file_hash in sorted(files.items()):
+        combined.update(separator)
+        combined.update(path.encode())
+        combined.update(b":")
+        combined.update(file_hash.encode())
+        separator = b"|"
+    return combined.hexdigest()
+
+@functools.lru_cache(maxsize=None)
+def _cached_directory_snapshot(directory, root_mtime_ns):
+    """Memoized directory snapshot, keyed on the directory's own mtime."""
+    return _compute_directory_snapshot(directory)
+
+def get_directory_snapshot(directory):
+    """Get per-file hashes and a combined root hash for a directory.
+    
+    Returns {"root": combined_hash, "files": {relpath: file_hash}} or None.
+    """
+    if not os.path.exists(directory):
         return None
     
-    combined = "|".join(sorted(hashes))
-    return hashlib.md5(combined.encode()).hexdigest()
+    # Memoized per process run so repeated change checks don't re-hash every file
+    return copy.deepcopy(_cached_directory_snapshot(directory, os.stat(directory).st_mtime_ns))
+
+def get_directory_hash(directory):
+    """Get combined hash of all files in a directory."""
+    snapshot = get_directory_snapshot(directory)
+    return snapshot["root"] if snapshot else None
+
+def diff_directory(stored, current):
+    """Compare two directory snapshots and return (added, modified, removed) relpath sets.
+    
+    Snapshots stored in the old single-hash format have no per-file entries, so every
+    current file is reported as modified to make sure its old vectors get replaced.
+    """
+    current_files = current.get("files", {}) if isinstance(current, dict) else {}
+    if not isinstance(stored, dict):
+        return set(), set(current_files), set()
+    
+    stored_files = stored.get("files", {})
+    added = current_files.keys() - stored_files.keys()
+    removed = stored_files.keys() - current_files.keys()
+    modified = {
+        path for path in current_files.keys() & stored_files.keys()
+        if current_files[path] != stored_files[path]
+    }
+    return set(added), modified, set(removed)
+
+def _describe_source_state(value):
+    """Short printable form of a stored/current source entry."""
+    if isinstance(value, dict) and "root" in value:
+        return f"{value['root']} ({len(value.get('files', {}))} files)"
+    return value
+
+# Cache of the last computed metadata, keyed on source flags and directory mtimes
+_current_metadata_cache = {"key": None, "data": None}
+
+def _metadata_cache_key():
+    """Build the cache key for get_current_metadata from config flags and directory mtimes."""
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+    
+    return (
+        os.path.exists(CHROMA_DB_PATH),
+        ENABLE_WEB_SOURCE, ENABLE_PDF_SOURCE, ENABLE_EXCEL_SOURCE,
+        ENABLE_DOC_SOURCE, ENABLE_SHAREPOINT_SOURCE, ENABLE_TEAMS_TRANSCRIPTS,
+        _mtime(PDF_SOURCE_DIR) if ENABLE_PDF_SOURCE else None,
+        _mtime(EXCEL_SOURCE_DIR) if ENABLE_EXCEL_SOURCE else None,
+        _mtime(DOC_SOURCE_DIR) if ENABLE_DOC_SOURCE else None,
+    )
+
+def reset_metadata_cache():
+    """Drop memoized metadata and directory hashes (call after a successful rebuild)."""
+    _current_metadata_cache["key"] = None
+    _current_metadata_cache["data"] = None
+    _cached_directory_snapshot.cache_clear()
 
 def get_current_metadata():
     """Get current metadata of enabled source files and directories."""
+    cache_key = _metadata_cache_key()
+    if _current_metadata_cache["key"] == cache_key:
+        metadata = copy.deepcopy(_current_metadata_cache["data"])
+        metadata["timestamp"] = datetime.now().isoformat()
+        return metadata
+    
+    metadata = _compute_current_metadata()
+    _current_metadata_cache["key"] = cache_key
+    _current_metadata_cache["data"] = copy.deepcopy(metadata)
+    return metadata
+
+def _compute_current_metadata():
+    """Compute metadata of enabled source files and directories."""
     metadata = {
         "timestamp": datetime.now().isoformat(),
         "vectorstore_exists": os.path.exists(CHROMA_DB_PATH),
@@ -72,17 +192,22 @@ def get_current_metadata():
         metadata["web_pagination"] = {"start_page": BLOG_START_PAGE}
         metadata["enabled_sources"].append("web")
     
-    if ENABLE_PDF_SOURCE:
-        metadata["pdfs"] = get_directory_hash(PDF_SOURCE_DIR)
-        metadata["enabled_sources"].append("pdfs")
-    
-    if ENABLE_EXCEL_SOURCE:
-        metadata["excel"] = get_directory_hash(EXCEL_SOURCE_DIR)
-        metadata["enabled_sources"].append("excel")
-    
-    if ENABLE_DOC_SOURCE:
-        metadata["docs"] = get_directory_hash(DOC_SOURCE_DIR)
-        metadata["enabled_sources"].append("docs")
+    # Directory sources are hashed in parallel; disabled ones are never touched on disk
+    directory_sources = [
+        (source, directory)
+        for enabled, source, directory in (
+            (ENABLE_PDF_SOURCE, "pdfs", PDF_SOURCE_DIR),
+            (ENABLE_EXCEL_SOURCE, "excel", EXCEL_SOURCE_DIR),
+            (ENABLE_DOC_SOURCE, "docs", DOC_SOURCE_DIR),
+        )
+        if enabled
+    ]
+    if directory_sources:
+        with ThreadPoolExecutor(max_workers=len(directory_sources)) as executor:
+            snapshots = executor.map(get_directory_snapshot, [directory for _, directory in directory_sources])
+            for (source, _), snapshot in zip(directory_sources, snapshots):
+                metadata[source] = snapshot
+                metadata["enabled_sources"].append(source)
     
     if ENABLE_SHAREPOINT_SOURCE:
         metadata["sharepoint"] = f"{SHAREPOINT_SITE_URL}{SHAREPOINT_START_PAGE}"
@@ -94,22 +219,52 @@ def get_current_metadata():
     
     return metadata
 
+# Parsed contents of METADATA_FILE, keyed on the file's mtime
+_stored_metadata_cache = {"mtime": None, "data": None}
+
 def load_stored_metadata():
     """Load previously stored metadata."""
-    if not os.path.exists(METADATA_FILE):
+    try:
+        mtime = os.stat(METADATA_FILE).st_mtime_ns
+    except OSError:
         return None
     
+    # Reuse the last parse while the file is unchanged on disk
+    if _stored_metadata_cache["mtime"] == mtime:
+        return copy.deepcopy(_stored_metadata_cache["data"])
+    
     try:
-        with open(METADATA_FILE, 'r') as f:
-            return json.load(f)
+        with open(METADATA_FILE, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
     except:
         return None
+    
+    _stored_metadata_cache["mtime"] = mtime
+    _stored_metadata_cache["data"] = data
+    return copy.deepcopy(data)
 
 def save_metadata(metadata):
     """Save current metadata."""
     os.makedirs(os.path.dirname(METADATA_FILE), exist_ok=True)
-    with open(METADATA_FILE, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    
+    if VECTORSTORE_METADATA_PRETTY:
+        payload = json.dumps(metadata, indent=2, sort_keys=True).encode("utf-8")
+    elif ORJSON_AVAILABLE:
+        payload = orjson.dumps(metadata, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(metadata, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    
+    # Write to a temp file and swap it in so a crash mid-write can't corrupt the metadata
+    tmp_file = f"{METADATA_FILE}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_file, METADATA_FILE)
+
+# Metadata keys that describe each source; sources not listed use their own name as key
+SOURCE_METADATA_KEYS = {
+    "web": ("url", "web_pagination"),
+}
 
 def get_changed_sources():
     """Get list of sources that have changed (incremental rebuild)."""
@@ -139,26 +294,21 @@ def get_changed_sources():
     print(f"[*] Checking enabled sources: {', '.join(enabled_sources)}")
     print(f"[*] Stored enabled sources: {', '.join(stored_enabled)}")
     
-    # Check if any NEW sources have been enabled
-    new_sources = set(enabled_sources) - set(stored_enabled)
-    if new_sources:
-        print(f"[!] New sources detected: {', '.join(new_sources)}")
-        changed_sources.extend(new_sources)
-    
-    # Check if any sources have changed their content
+    # Single pass: a source changed if it is newly enabled or any of its metadata keys differ
+    stored_enabled_set = set(stored_enabled)
     for source in enabled_sources:
-        if stored_metadata.get(source) != current_metadata.get(source):
-            print(f"[!] {source} has changed")
-            print(f"   Stored: {stored_metadata.get(source)}")
-            print(f"   Current: {current_metadata.get(source)}")
-            if source not in changed_sources:
+        if source not in stored_enabled_set:
+            print(f"[!] New source detected: {source}")
+            changed_sources.append(source)
+            continue
+        
+        for key in SOURCE_METADATA_KEYS.get(source, (source,)):
+            if stored_metadata.get(key) != current_metadata.get(key):
+                print(f"[!] {source} has changed ({key})")
+                print(f"   Stored: {_describe_source_state(stored_metadata.get(key))}")
+                print(f"   Current: {_describe_source_state(current_metadata.get(key))}")
                 changed_sources.append(source)
-
-    # Additional check: if web pagination changed, mark web as changed
-    if "web" in enabled_sources:
-        if stored_metadata.get("web_pagination") != current_metadata.get("web_pagination"):
-            print("[!] web pagination settings have changed")
-            changed_sources.append("web")
+                break
     
     if changed_sources:
         print(f"[*] Changed sources: {', '.join(changed_sources)}")
@@ -168,16 +318,43 @@ def get_changed_sources():
     return changed_sources
 
 def should_rebuild_vectorstore():
-    """Check if vectorstore needs to be rebuilt based on enabled source changes."""
-    changed_sources = get_changed_sources()
-    return len(changed_sources) > 0
+    """Check if vectorstore needs to be rebuilt based on enabled source changes.
+    
+    Returns the list of changed sources (empty if no rebuild is needed) so callers
+    can pass it on instead of running the change check again.
+    """
+    return get_changed_sources()
+
+# Last opened vectorstore handle, reused while the underlying store is unchanged
+_vectorstore_cache = {"key": None, "store": None}
+
+def _vectorstore_cache_key():
+    """Identify the current on-disk/remote store so a cached handle can be reused."""
+    if VECTORSTORE_BACKEND == "mongodb" and MONGODB_AVAILABLE:
+        return ("mongodb", MONGODB_VECTORSTORE_COLLECTION)
+    
+    try:
+        stat = os.stat(CHROMA_DB_PATH)
+    except OSError:
+        return None
+    # A rebuilt or renamed-aside store gets a new inode
+    return ("chroma", stat.st_ino, stat.st_mtime_ns)
+
+def reset_vectorstore_cache():
+    """Forget the cached vectorstore handle (call after rebuilding or removing the store)."""
+    _vectorstore_cache["key"] = None
+    _vectorstore_cache["store"] = None
 
 def load_existing_vectorstore():
     """Load existing vectorstore without rebuilding."""
+    cache_key = _vectorstore_cache_key()
+    if cache_key is not None and _vectorstore_cache["key"] == cache_key:
+        return _vectorstore_cache["store"]
+    
     print(f"[*] Loading existing vectorstore (backend: {VECTORSTORE_BACKEND})...")
     
     try:
-        embeddings = OpenAIEmbeddings()
+        embeddings = get_embeddings()
         
         # Use MongoDB backend if configured
         if VECTORSTORE_BACKEND == "mongodb" and MONGODB_AVAILABLE:
@@ -188,7 +365,6 @@ def load_existing_vectorstore():
             stats = vectorstore.get_collection_stats()
             total_docs = stats["total_documents"]
             print(f"[OK] Loaded MongoDB vectorstore with {total_docs} documents")
-            return vectorstore
         
         # Default: Use ChromaDB
         else:
@@ -200,20 +376,28 @@ def load_existing_vectorstore():
             # Test if vectorstore is working
             total_docs = vectorstore._collection.count()
             print(f"[OK] Loaded ChromaDB vectorstore with {total_docs} documents")
-            return vectorstore
+        
+        _vectorstore_cache["key"] = cache_key
+        _vectorstore_cache["store"] = vectorstore
+        return vectorstore
             
     except Exception as e:
         print(f"[!] Failed to load existing vectorstore: {e}")
         return None
 
-def rebuild_vectorstore_if_needed():
-    """Rebuild vectorstore incrementally - only process changed sources."""
+def rebuild_vectorstore_if_needed(changed_sources=None):
+    """Rebuild vectorstore incrementally - only process changed sources.
+    
+    Pass changed_sources from an earlier should_rebuild_vectorstore() call to skip
+    re-running the change check.
+    """
     print("=" * 60)
     print("INCREMENTAL VECTORSTORE REBUILD")
     print("=" * 60)
     
     # Get changed sources
-    changed_sources = get_changed_sources()
+    if changed_sources is None:
+        changed_sources = get_changed_sources()
     
     if not changed_sources:
         print("[OK] No changes detected - using existing vectorstore")
@@ -221,17 +405,132 @@ def rebuild_vectorstore_if_needed():
     
     print(f"[*] Changed sources detected: {', '.join(changed_sources)}")
     
+    # Snapshot sources once up front; the same dict drives the rebuild and is saved after it
+    current_metadata = get_current_metadata()
+    
     # Use incremental rebuild for changed sources only
-    vectorstore = build_incremental_vectorstore(changed_sources)
+    vectorstore = build_incremental_vectorstore(changed_sources, current_metadata)
     
     # Save metadata after successful rebuild
-    current_metadata = get_current_metadata()
+    reset_vectorstore_cache()
+    current_metadata["vectorstore_exists"] = os.path.exists(CHROMA_DB_PATH)
     save_metadata(current_metadata)
+    reset_metadata_cache()
     print("[OK] Saved vectorstore metadata for future change detection")
     
     return vectorstore
 
-def build_incremental_vectorstore(changed_sources):
+def delete_app_vectors(vectorstore, filter):
+    """
+    Delete vectors matching a MongoDB filter from a MongoDBVectorStore.
+    
+    When the store is the app collection, the indexed-content Bloom filter is
+    reset too, so refetched copies of the deleted texts are not skipped as
+    already indexed. Returns the number of documents deleted.
+    """
+    deleted_count = vectorstore.delete_where(filter)
+    if deleted_count and vectorstore.collection_name == MONGODB_VECTORSTORE_COLLECTION:
+        reset_bloom()
+    return deleted_count
+
+def _delete_file_vectors(vectorstore, file_paths):
+    """Remove all vectors belonging to the given source files."""
+    file_paths = sorted(file_paths)
+    if not file_paths:
+        return
+    # One indexed $in predicate instead of a delete round trip per file
+    try:
+        if hasattr(vectorstore, "_collection"):
+            vectorstore._collection.delete(where={"file_path": {"$in": file_paths}})
+            reset_bloom()
+        else:
+            delete_app_vectors(vectorstore, {"metadata.file_path": {"$in": file_paths}})
+    except Exception as e:
+        print(f"[WARNING] Could not delete vectors for {len(file_paths)} files: {e}")
+
+def _prepare_changed_files(vectorstore, directory, source, stored_metadata, current_metadata):
+    """Diff a directory source, drop vectors of modified/removed files and return files to (re)process."""
+    added, modified, removed = diff_directory(stored_metadata.get(source), current_metadata.get(source))
+    print(f"   {source}: {len(added)} added, {len(modified)} modified, {len(removed)} removed")
+    
+    stale = modified | removed
+    if stale:
+        _delete_file_vectors(vectorstore, [os.path.join(directory, path) for path in stale])
+        print(f"[OK] Removed vectors for {len(stale)} stale {source} files")
+    
+    return added | modified
+
+# Texts per embedding request and number of requests kept in flight during bulk ingest
+EMBEDDING_BATCH_SIZE = 500
+EMBEDDING_CONCURRENCY = 8
+
+async def _embed_batches_async(embeddings, batches):
+    """Embed text batches concurrently, keeping at most EMBEDDING_CONCURRENCY requests in flight."""
+    semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+    
+    async def embed(batch):
+        async with semaphore:
+            return await embeddings.aembed_documents(batch)
+    
+    return await asyncio.gather(*(embed(batch) for batch in batches))
+
+def embed_texts_concurrently(embeddings, texts):
+    """Embed texts in EMBEDDING_BATCH_SIZE batches, overlapping the API round-trips.
+    
+    Falls back to sequential embedding when called from inside a running event loop.
+    Rate-limit retries with backoff are handled by the OpenAI client itself.
+    """
+    batches = [texts[i:i + EMBEDDING_BATCH_SIZE] for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)]
+    
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        results = asyncio.run(_embed_batches_async(embeddings, batches))
+    else:
+        results = [embeddings.embed_documents(batch) for batch in batches]
+    
+    return [vector for batch_vectors in results for vector in batch_vectors]
+
+# Rows per Chroma upsert call (one SQLite write transaction each)
+CHROMA_WRITE_BATCH_SIZE = 2000
+
+def _document_id(text, metadata):
+    """Stable id for a chunk: hash of its origin (file path or source) and content."""
+    origin = metadata.get("file_path") or metadata.get("source") or ""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(origin.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+def add_documents_batched(vectorstore, docs):
+    """Embed documents with concurrent requests, then write them with precomputed embeddings."""
+    texts = [doc.page_content for doc in docs]
+    metadatas = [doc.metadata for doc in docs]
+    
+    print(f"[*] Embedding {len(texts)} documents ({EMBEDDING_BATCH_SIZE} per request, {EMBEDDING_CONCURRENCY} concurrent)...")
+    vectors = embed_texts_concurrently(vectorstore.embeddings, texts)
+    
+    if hasattr(vectorstore, "_collection"):
+        # Content-derived ids make re-runs idempotent: unchanged chunks are overwritten, not duplicated
+        rows = {}
+        for text, metadata, vector in zip(texts, metadatas, vectors):
+            rows[_document_id(text, metadata)] = (text, metadata, vector)
+        
+        ids = list(rows)
+        for i in range(0, len(ids), CHROMA_WRITE_BATCH_SIZE):
+            batch_ids = ids[i:i + CHROMA_WRITE_BATCH_SIZE]
+            vectorstore._collection.upsert(
+                ids=batch_ids,
+                documents=[rows[doc_id][0] for doc_id in batch_ids],
+                metadatas=[rows[doc_id][1] for doc_id in batch_ids],
+                embeddings=[rows[doc_id][2] for doc_id in batch_ids],
+            )
+        return ids
+    
+    return vectorstore.add_texts(texts, metadatas, embeddings=vectors)
+
+def build_incremental_vectorstore(changed_sources, current_metadata=None):
     """Build vectorstore incrementally - only process changed sources."""
     from app.helpers import build_vectorstore, build_combined_vectorstore
     
@@ -249,34 +548,48 @@ def build_incremental_vectorstore(changed_sources):
         print("[!] Failed to load existing vectorstore - doing full rebuild")
         return build_selective_vectorstore()
     
+    # Per-file snapshots let directory sources re-embed only the files that changed
+    stored_metadata = load_stored_metadata() or {}
+    if current_metadata is None:
+        current_metadata = get_current_metadata()
+    
     # Process only changed sources
     new_docs = []
+    # Web/SharePoint/Teams are re-fetched wholesale and deduplicated against the index
+    refetched_docs = []
+    bloom = None
     
     if "web" in changed_sources:
         print("[*] Processing changed web content...")
         from app.helpers import fetch_web_content
         web_docs = fetch_web_content(WEB_SOURCE_URL)
-        new_docs.extend(web_docs)
+        refetched_docs.extend(web_docs)
         print(f"[OK] Fetched {len(web_docs)} web documents")
     
     if "pdfs" in changed_sources:
         print("[*] Processing changed PDF files...")
-        from app.helpers import process_pdf_files
-        pdf_docs = process_pdf_files(PDF_SOURCE_DIR)
+        from app.pdf_processor import process_pdf_directory, chunk_pdf_documents
+        changed_files = _prepare_changed_files(existing_vectorstore, PDF_SOURCE_DIR, "pdfs", stored_metadata, current_metadata)
+        pdf_docs = process_pdf_directory(PDF_SOURCE_DIR, only_files=changed_files)
+        pdf_docs = chunk_pdf_documents(pdf_docs, chunk_size=1000, chunk_overlap=200)
         new_docs.extend(pdf_docs)
         print(f"[OK] Processed {len(pdf_docs)} PDF documents")
     
     if "excel" in changed_sources:
         print("[*] Processing changed Excel files...")
-        from app.helpers import process_excel_files
-        excel_docs = process_excel_files(EXCEL_SOURCE_DIR)
+        from app.excel_processor import process_excel_directory, chunk_excel_documents
+        changed_files = _prepare_changed_files(existing_vectorstore, EXCEL_SOURCE_DIR, "excel", stored_metadata, current_metadata)
+        excel_docs = process_excel_directory(EXCEL_SOURCE_DIR, only_files=changed_files)
+        excel_docs = chunk_excel_documents(excel_docs, chunk_size=1000, chunk_overlap=200)
         new_docs.extend(excel_docs)
         print(f"[OK] Processed {len(excel_docs)} Excel documents")
     
     if "docs" in changed_sources:
         print("[*] Processing changed Word documents...")
-        from app.helpers import process_doc_files
-        doc_docs = process_doc_files(DOC_SOURCE_DIR)
+        from app.doc_processor import process_doc_directory, chunk_doc_documents
+        changed_files = _prepare_changed_files(existing_vectorstore, DOC_SOURCE_DIR, "docs", stored_metadata, current_metadata)
+        doc_docs = process_doc_directory(DOC_SOURCE_DIR, only_files=changed_files)
+        doc_docs = chunk_doc_documents(doc_docs, chunk_size=1000, chunk_overlap=200)
         new_docs.extend(doc_docs)
         print(f"[OK] Processed {len(doc_docs)} Word documents")
     
@@ -285,7 +598,7 @@ def build_incremental_vectorstore(changed_sources):
         from app.sharepoint_processor import process_sharepoint_content
         try:
             sharepoint_docs = process_sharepoint_content()
-            new_docs.extend(sharepoint_docs)
+            refetched_docs.extend(sharepoint_docs)
             print(f"[OK] Processed {len(sharepoint_docs)} SharePoint documents")
         except Exception as e:
             print(f"[ERROR] SharePoint processing failed: {e}")
@@ -299,20 +612,31 @@ def build_incremental_vectorstore(changed_sources):
                 user_emails=TEAMS_TRANSCRIPT_USER_EMAILS,
                 days_back=TEAMS_TRANSCRIPT_DAYS_BACK,
             )
-            new_docs.extend(teams_docs)
+            refetched_docs.extend(teams_docs)
             print(f"[OK] Processed {len(teams_docs)} Teams transcripts")
         except Exception as e:
             print(f"[ERROR] Teams transcript processing failed: {e}")
     
+    # Directory sources are not deduplicated: their stale vectors were deleted per file above
+    if refetched_docs:
+        bloom = load_or_build_bloom(existing_vectorstore)
+        fresh_docs = skip_indexed_documents(refetched_docs, bloom)
+        print(f"[OK] Skipped {len(refetched_docs) - len(fresh_docs)} already-indexed documents")
+        new_docs.extend(fresh_docs)
+    
     if not new_docs:
         print("[WARNING] No new documents found for changed sources")
         return existing_vectorstore
     
     # Add new documents to existing vectorstore
+    # No backup is taken here: the only snapshot is the single pre-rebuild one in
+    # manage_vectorstore_backup_and_rebuild, so incremental updates never copy the store
     print(f"[*] Adding {len(new_docs)} new documents to existing vectorstore...")
     try:
-        existing_vectorstore.add_documents(new_docs)
+        add_documents_batched(existing_vectorstore, new_docs)
         print("[OK] Successfully added new documents to vectorstore")
+        if bloom is not None:
+            bloom.save()
         return existing_vectorstore
     except Exception as e:
         print(f"[ERROR] Failed to add documents incrementally: {e}")
@@ -323,6 +647,9 @@ def build_selective_vectorstore():
     """Build vectorstore with only enabled sources."""
     from app.helpers import build_vectorstore, build_combined_vectorstore
     
+    # A full rebuild invalidates the indexed-content filter
+    reset_bloom()
+    
     # Collect enabled sources
     enabled_dirs = []
     enabled_sources = []
@@ -375,6 +702,40 @@ def build_selective_vectorstore():
         print("Warning: No sources enabled!")
         return build_vectorstore(WEB_SOURCE_URL)  # Fallback to web
 
+def _fast_copytree(src, dst):
+    """Copy a directory tree as cheaply as the filesystem allows.
+    
+    Tries a copy-on-write reflink first (XFS/Btrfs/APFS), then a regular copy.
+    Both give the backup its own data, so later writes to the source never reach it.
+    Chroma persists on every write, so no explicit flush is needed beforehand.
+    """
+    try:
+        subprocess.run(["cp", "-r", "--reflink=always", src, dst], check=True, capture_output=True)
+        return "reflink"
+    except (OSError, subprocess.CalledProcessError):
+        shutil.rmtree(dst, ignore_errors=True)
+    
+    shutil.copytree(src, dst)
+    return "copy"
+
+def _remove_tree_in_background(path):
+    """Rename a directory aside and delete it on a background thread.
+    
+    The rename is a single directory-entry update, so callers can reuse `path`
+    immediately instead of waiting for every file to be unlinked.
+    """
+    trash_path = f"{path}.trash.{os.getpid()}.{time.time_ns()}"
+    os.rename(path, trash_path)
+    
+    # Also sweep trash left behind by earlier runs that exited before deletion finished
+    trash_paths = [trash_path] + [p for p in glob.glob(f"{path}.trash.*") if p != trash_path]
+    
+    def _remove_all():
+        for trash in trash_paths:
+            shutil.rmtree(trash, ignore_errors=True)
+    
+    threading.Thread(target=_remove_all, daemon=True).start()
+
 def manage_vectorstore_backup_and_rebuild():
     """Manage vectorstore backup and rebuild with proper versioning."""
     import shutil
@@ -400,12 +761,12 @@ def manage_vectorstore_backup_and_rebuild():
         try:
             # Remove old backup if it exists
             if os.path.exists(backup_path):
-                shutil.rmtree(backup_path)
+                _remove_tree_in_background(backup_path)
                 print("[OK] Removed old backup vectorstore")
             
             # Create backup of current vectorstore
-            shutil.copytree(current_path, backup_path)
-            print("[OK] Created backup of existing vectorstore")
+            method = _fast_copytree(current_path, backup_path)
+            print(f"[OK] Created backup of existing vectorstore ({method})")
             print(f"  Backup created at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
         except Exception as e:
@@ -414,9 +775,10 @@ def manage_vectorstore_backup_and_rebuild():
         print("[INFO] No existing vectorstore found - this will be the first build")
     
     # Step 2: Remove current vectorstore to force fresh rebuild
+    reset_vectorstore_cache()
     if os.path.exists(current_path):
         try:
-            shutil.rmtree(current_path)
+            _remove_tree_in_background(current_path)
             print("[OK] Removed current vectorstore for fresh rebuild")
         except Exception as e:
             print(f"[WARNING] Could not remove current vectorstore: {e}")
@@ -426,16 +788,19 @@ def manage_vectorstore_backup_and_rebuild():
     print("-" * 60)
     return rebuild_vectorstore_if_needed()
 
-def initialize_vectorstore():
+def initialize_vectorstore(changed_sources=None):
     """Smart vectorstore initialization that only rebuilds when needed."""
     print("=" * 60)
     print(">> INITIALIZING CF-CHATBOT KNOWLEDGE BASE")
     print("=" * 60)
     
     # Check if rebuild is needed
-    if should_rebuild_vectorstore():
+    if changed_sources is None:
+        changed_sources = should_rebuild_vectorstore()
+    
+    if changed_sources:
         print("[*] Rebuilding vectorstore...")
-        vectorstore = rebuild_vectorstore_if_needed()
+        vectorstore = rebuild_vectorstore_if_needed(changed_sources)
     else:
         # Try to load existing vectorstore
         vectorstore = load_existing_vectorstore()
@@ -492,32 +857,90 @@ def check_and_rebuild_if_needed():
     print("[*] INITIALIZE_VECTORSTORE=true - checking if rebuild is needed...")
     
     # Check if rebuild is needed based on enabled sources
-    if should_rebuild_vectorstore():
+    changed_sources = should_rebuild_vectorstore()
+    if changed_sources:
         print("[*] Rebuild needed - initializing vectorstore...")
-        return initialize_vectorstore()
+        return initialize_vectorstore(changed_sources)
     else:
         print("[OK] No rebuild needed - using existing vectorstore")
         return True
 
-# Initialize vectorstore - always try to load existing
-vectorstore = get_vectorstore()
-
-# Check if rebuild is needed (only if INITIALIZE_VECTORSTORE=true)
-if INITIALIZE_VECTORSTORE:
-    print("[*] INITIALIZE_VECTORSTORE=true - checking for rebuild...")
-    rebuild_result = check_and_rebuild_if_needed()
-    if rebuild_result:
-        # Reload vectorstore after potential rebuild
-        vectorstore = get_vectorstore()
-
-if vectorstore:
-    retriever = vectorstore.as_retriever(
-        search_type="similarity",
-        search_kwargs={
-            "k": 25  # Fetch more documents for better coverage
-        }
-    )
-    print("[OK] Vectorstore available for chatbot")
-else:
-    retriever = None
-    print("[INFO] No vectorstore available - set INITIALIZE_VECTORSTORE=true to create one")
\ No newline at end of file
+def _load_module_vectorstore():
+    """Load the app-wide vectorstore, running the INITIALIZE_VECTORSTORE rebuild check if enabled."""
+    # Always try to load existing
+    store = get_vectorstore()
+    
+    # Check if rebuild is needed (only if INITIALIZE_VECTORSTORE=true)
+    if INITIALIZE_VECTORSTORE:
+        print("[*] INITIALIZE_VECTORSTORE=true - checking for rebuild...")
+        rebuild_result = check_and_rebuild_if_needed()
+        if rebuild_result:
+            # Reload vectorstore after potential rebuild
+            store = get_vectorstore()
+    
+    if store:
+        print("[OK] Vectorstore available for chatbot")
+    else:
+        print("[INFO] No vectorstore available - set INITIALIZE_VECTORSTORE=true to create one")
+    return store
+
+class _LazyVectorstore:
+    """Proxy that loads the vectorstore on first use instead of at import time.
+    
+    Truthiness reflects whether a vectorstore is available, so use `if vectorstore:`
+    rather than `is None` checks.
+    """
+    
+    def __init__(self):
+        self._store = None
+        self._loaded = False
+        self._lock = threading.Lock()
+    
+    def resolve(self):
+        """Load (once) and return the underlying vectorstore, or None if unavailable."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._store = _load_module_vectorstore()
+                    self._loaded = True
+        return self._store
+    
+    def __getattr__(self, name):
+        store = self.resolve()
+        if store is None:
+            raise AttributeError(f"No vectorstore available (requested '{name}')")
+        return getattr(store, name)
+    
+    def __bool__(self):
+        return self.resolve() is not None
+
+class _LazyRetriever:
+    """Proxy that builds the similarity retriever from the lazy vectorstore on first use."""
+    
+    def __init__(self, store):
+        self._store = store
+        self._retriever = None
+    
+    def resolve(self):
+        """Build (once) and return the underlying retriever, or None if no vectorstore."""
+        if self._retriever is None and self._store:
+            self._retriever = self._store.as_retriever(
+                search_type="similarity",
+                search_kwargs={
+                    "k": 25  # Fetch more documents for better coverage
+                }
+            )
+        return self._retriever
+    
+    def __getattr__(self, name):
+        retriever = self.resolve()
+        if retriever is None:
+            raise AttributeError(f"No retriever available (requested '{name}')")
+        return getattr(retriever, name)
+    
+    def __bool__(self):
+        return self.resolve() is not None
+
+# Loaded lazily on first access so importing this module does no I/O
+vectorstore = _LazyVectorstore()
+retriever = _LazyRetriever(vectorstore)
@@ -0,0 +1,88 @@
+"""
+Shared handles for the check/debug scripts.
+
+Each handle is opened once per process, so scripts that are imported and run
+together (or call each other) reuse one MongoDB client, one embeddings client
+and one vector store instead of reconnecting in every function.
+"""
+import functools
+import hashlib
+import os
+import shelve
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from pymongo import MongoClient
+from config import MONGODB_URL, MONGODB_DATABASE, MONGODB_VECTORSTORE_COLLECTION
+
+QUERY_EMBEDDING_CACHE = ".cache/query_embeddings"
+
+# Model the check scripts have always embedded with; pass model=None for the
+# OpenAIEmbeddings default that app.helpers.get_embeddings() builds the app's store with
+CHECK_EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+@functools.lru_cache(maxsize=None)
+def get_mongo_client():
+    """Return the shared MongoDB client."""
+    return MongoClient(MONGODB_URL)
+
+
+@functools.lru_cache(maxsize=None)
+def get_vector_collection(collection_name: str = MONGODB_VECTORSTORE_COLLECTION):
+    """Return the raw MongoDB collection backing the vector store."""
+    return get_mongo_client()[MONGODB_DATABASE][collection_name]
+
+
+@functools.lru_cache(maxsize=None)
+def get_embeddings(model: Optional[str] = CHECK_EMBEDDING_MODEL):
+    """
+    Return the shared embeddings client for a model.
+
+    Defaults to text-embedding-3-small, which the check scripts hard-coded;
+    model=None gives the OpenAIEmbeddings default used by the app's store.
+    """
+    from langchain_openai import OpenAIEmbeddings
+    if model is None:
+        return OpenAIEmbeddings()
+    return OpenAIEmbeddings(
+        model=model,
+        openai_api_key=os.getenv("OPENAI_API_KEY")
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_vectorstore(
+    collection_name: str = MONGODB_VECTORSTORE_COLLECTION,
+    model: Optional[str] = CHECK_EMBEDDING_MODEL,
+):
+    """Return a MongoDBVectorStore over the shared embeddings client for a model."""
+    from app.mongodb_vectorstore import MongoDBVectorStore
+    return MongoDBVectorStore(
+        collection_name=collection_name,
+        embedding_function=get_embeddings(model)
+    )
+
+
+def embed_queries_cached(embeddings, queries, cache_path: str = QUERY_EMBEDDING_CACHE):
+    """
+    Embed queries, reusing vectors persisted by earlier runs.
+
+    Keys combine the embedding model with a hash of the query text, so switching
+    models never returns a stale vector. Only the misses are sent to the API,
+    in a single batch.
+    """
+    model = getattr(embeddings, "model", "")
+    keys = [f"{model}:{hashlib.sha256(query.encode('utf-8')).hexdigest()}" for query in queries]
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with shelve.open(cache_path) as cache:
+        missing = [(key, query) for key, query in zip(keys, queries) if key not in cache]
+        if missing:
+            vectors = embeddings.embed_documents([query for _, query in missing])
+            for (key, _), vector in zip(missing, vectors):
+                cache[key] = vector
+        return [cache[key] for key in keys]
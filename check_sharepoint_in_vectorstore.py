@@ -4,6 +4,8 @@ Check if SharePoint data is in vectorstore
 """
 
 from app.vectorstore import vectorstore
+from check_common import embed_queries_cached
+from config import VECTORSTORE_BACKEND
 import json
 
 def check_sharepoint_in_vectorstore():
@@ -28,12 +30,20 @@ def check_sharepoint_in_vectorstore():
     
     print(f"\n[*] Testing {len(test_queries)} SharePoint-related queries...\n")
     
-    for i, query in enumerate(test_queries, 1):
+    # Embed every query in one API call instead of one per search,
+    # reusing embeddings cached on disk by previous runs
+    try:
+        query_embeddings = embed_queries_cached(vectorstore.embeddings, test_queries)
+    except Exception as e:
+        print(f"❌ Could not embed test queries: {e}")
+        return
+    
+    for i, (query, query_embedding) in enumerate(zip(test_queries, query_embeddings), 1):
         print(f"Query {i}: {query}")
         
         try:
-            # Use similarity_search to find relevant documents
-            docs = vectorstore.similarity_search(query, k=3)
+            # Search with the precomputed query embedding
+            docs = vectorstore.similarity_search_by_vector(query_embedding, k=3)
             
             print(f"   Found {len(docs)} relevant documents:")
             
@@ -59,18 +69,23 @@ def check_sharepoint_in_vectorstore():
     
     # Count documents by source type
     print("\n[*] Analyzing document distribution...")
-    print("Note: Getting exact counts requires iterating through all documents")
-    print("Vectorstore currently has documents loaded.")
     
-    # Try to get collection info
+    # Counted through the same store the searches above used
     try:
-        if hasattr(vectorstore, '_collection'):
-            # Try to get count from collection
-            try:
-                count = vectorstore._collection.count()
-                print(f"\nTotal documents in vectorstore: {count}")
-            except:
-                print("\nCould not get exact count")
+        if VECTORSTORE_BACKEND == "mongodb":
+            # Grouped and counted inside MongoDB - only the per-type totals come back,
+            # instead of every document's metadata being pulled into Python to tally
+            pipeline = [
+                {"$group": {"_id": {"$ifNull": ["$metadata.source_type", "unknown"]}, "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]
+            distribution = list(vectorstore.collection.aggregate(pipeline))
+            total = sum(row["count"] for row in distribution)
+            print(f"\nTotal documents in vectorstore: {total}")
+            for row in distribution:
+                print(f"   {row['_id']}: {row['count']}")
+        else:
+            print(f"\nTotal documents in vectorstore: {vectorstore._collection.count()}")
     except Exception as e:
         print(f"Could not access collection info: {e}")
 
@@ -1,29 +1,26 @@
 """
 Check the quality and content of specific SharePoint pages in MongoDB
 """
-from pymongo import MongoClient
-from config import MONGODB_URL, MONGODB_DATABASE, MONGODB_VECTORSTORE_COLLECTION
-from dotenv import load_dotenv
+import re
+import sys
+from check_common import get_vector_collection
 
-load_dotenv()
+# Flatten line breaks in one C-level pass when printing single-line previews
+PREVIEW_FLATTEN = str.maketrans("\r\n", "  ")
 
 def check_sharepoint_pages():
     """Check specific SharePoint pages in MongoDB."""
     
-    client = MongoClient(MONGODB_URL)
-    db = client[MONGODB_DATABASE]
-    collection = db[MONGODB_VECTORSTORE_COLLECTION]
+    collection = get_vector_collection()
     
     print("\n" + "="*80)
     print("CHECKING SHAREPOINT PAGE CONTENT QUALITY")
     print("="*80 + "\n")
     
-    # Find all SharePoint documents
-    sharepoint_docs = list(collection.find({
-        "metadata.source": "cloudfuze_doc360"
-    }))
+    sharepoint_filter = {"metadata.source": "cloudfuze_doc360"}
     
-    print(f"Total SharePoint documents: {len(sharepoint_docs)}\n")
+    # Count SharePoint documents without fetching them
+    print(f"Total SharePoint documents: {collection.count_documents(sharepoint_filter)}\n")
     
     # Look for specific pages
     target_pages = [
@@ -38,37 +35,47 @@ def check_sharepoint_pages():
         print(f"Searching for: {target}")
         print(f"{'='*80}")
         
-        found = False
-        for doc in sharepoint_docs:
+        # Let MongoDB check whether target is in the title or the first 500 chars of content
+        target_pattern = re.escape(target)
+        doc = collection.find_one(
+            {
+                **sharepoint_filter,
+                "$or": [
+                    {"metadata.page_title": {"$regex": target_pattern, "$options": "i"}},
+                    {"$expr": {"$regexMatch": {
+                        "input": {"$substrCP": ["$text", 0, 500]},
+                        "regex": target_pattern,
+                        "options": "i",
+                    }}},
+                ],
+            },
+            {"text": 1, "metadata": 1},
+        )
+        
+        if doc:
             content = doc.get('text', '')
             metadata = doc.get('metadata', {})
             page_title = metadata.get('page_title', '')
             page_url = metadata.get('page_url', '')
+            print(f"\n✓ FOUND!")
+            print(f"  Page Title: {page_title}")
+            print(f"  Page URL: {page_url}")
+            print(f"  Content Length: {len(content)} characters")
+            print(f"\n  Content Preview (first 800 chars):")
+            print(f"  {'-'*76}")
+            print(f"  {content[:800]}")
+            print(f"  {'-'*76}")
             
-            # Check if target is in title or content
-            if target.lower() in page_title.lower() or target.lower() in content.lower()[:500]:
-                found = True
-                print(f"\n✓ FOUND!")
-                print(f"  Page Title: {page_title}")
-                print(f"  Page URL: {page_url}")
-                print(f"  Content Length: {len(content)} characters")
-                print(f"\n  Content Preview (first 800 chars):")
-                print(f"  {'-'*76}")
-                print(f"  {content[:800]}")
-                print(f"  {'-'*76}")
-                
-                # Check if it has meaningful content
-                if len(content) < 200:
-                    print("\n  ⚠️  WARNING: Content is very short!")
-                
-                # Check for key terms
-                key_terms = ['migration', 'features', 'supported', 'combination', 'source', 'destination']
-                found_terms = [term for term in key_terms if term.lower() in content.lower()]
-                print(f"\n  Key terms found: {', '.join(found_terms) if found_terms else 'None'}")
-                
-                break
-        
-        if not found:
+            # Check if it has meaningful content
+            if len(content) < 200:
+                print("\n  ⚠️  WARNING: Content is very short!")
+            
+            # Check for key terms
+            key_terms = ['migration', 'features', 'supported', 'combination', 'source', 'destination']
+            content_lower = content.lower()
+            found_terms = [term for term in key_terms if term in content_lower]
+            print(f"\n  Key terms found: {', '.join(found_terms) if found_terms else 'None'}")
+        else:
             print(f"\n✗ NOT FOUND in any SharePoint document")
     
     # Summary of all pages
@@ -76,17 +83,29 @@ def check_sharepoint_pages():
     print("ALL SHAREPOINT PAGES SUMMARY")
     print(f"{'='*80}\n")
     
-    for i, doc in enumerate(sharepoint_docs, 1):
-        metadata = doc.get('metadata', {})
-        content = doc.get('text', '')
-        page_title = metadata.get('page_title', 'Unknown')
-        content_length = len(content)
+    # Compute title, length and a 50-char preview server-side so full bodies never leave MongoDB
+    summary = collection.aggregate([
+        {"$match": sharepoint_filter},
+        {"$project": {
+            "_id": 0,
+            "page_title": {"$ifNull": ["$metadata.page_title", "Unknown"]},
+            "content_length": {"$strLenCP": {"$ifNull": ["$text", ""]}},
+            "content_preview": {"$substrCP": [{"$ifNull": ["$text", ""]}, 0, 50]},
+        }},
+    ])
+    
+    # One line pair per page: collect them and write once instead of two prints per page
+    lines = []
+    for i, doc in enumerate(summary, 1):
+        page_title = doc['page_title']
+        content_length = doc['content_length']
         
         # Show first 50 chars of content
-        content_preview = content[:50].replace('\n', ' ')
+        content_preview = doc['content_preview'].translate(PREVIEW_FLATTEN)
         
-        print(f"{i:2d}. {page_title}")
-        print(f"    Length: {content_length} chars | Preview: {content_preview}...")
+        lines.append(f"{i:2d}. {page_title}\n")
+        lines.append(f"    Length: {content_length} chars | Preview: {content_preview}...\n")
+    sys.stdout.write("".join(lines))
     
     print(f"\n{'='*80}\n")
 
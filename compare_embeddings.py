@@ -1,29 +1,90 @@
 """
 Compare embeddings between blog content and SharePoint content
 """
-from pymongo import MongoClient
-from config import MONGODB_URL, MONGODB_DATABASE, MONGODB_VECTORSTORE_COLLECTION
-from dotenv import load_dotenv
+from collections import Counter
+from check_common import get_vector_collection
 import numpy as np
 
-load_dotenv()
+# Embeddings sampled per source for the similarity audit
+AUDIT_SAMPLE_SIZE = 200
+
+
+def load_normalized_embeddings(collection, source, sample_size=AUDIT_SAMPLE_SIZE):
+    """Load a random sample of one source's embeddings as an L2-normalized float32 matrix."""
+    cursor = collection.aggregate([
+        {"$match": {"metadata.source": source, "embedding": {"$type": "array"}}},
+        {"$sample": {"size": sample_size}},
+        {"$project": {"_id": 0, "embedding": 1}},
+    ])
+    vectors = [doc["embedding"] for doc in cursor]
+    if not vectors:
+        return np.empty((0, 0), dtype=np.float32)
+    
+    # Mixed-model collections hold vectors of several lengths, which can't be
+    # stacked; audit the most common dimension and report the rest
+    dimensions = Counter(len(vector) for vector in vectors)
+    if len(dimensions) > 1:
+        dimension = dimensions.most_common(1)[0][0]
+        others = ", ".join(f"{n} x {dim}" for dim, n in sorted(dimensions.items()) if dim != dimension)
+        print(f"  [WARNING] {source}: mixed embedding lengths, using {dimensions[dimension]} x {dimension} (skipping {others})")
+        vectors = [vector for vector in vectors if len(vector) == dimension]
+    
+    matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def mean_cosine(a, b, same_rows=False):
+    """Mean pairwise cosine similarity of two normalized matrices (one BLAS matmul)."""
+    sims = a @ b.T
+    if same_rows:
+        # Leave out each vector's similarity with itself
+        n = len(a)
+        return float((sims.sum() - np.trace(sims)) / (n * (n - 1))) if n > 1 else float("nan")
+    return float(sims.mean())
 
 def compare_embeddings():
     """Compare embedding dimensions and types for blog vs SharePoint."""
     
-    client = MongoClient(MONGODB_URL)
-    db = client[MONGODB_DATABASE]
-    collection = db[MONGODB_VECTORSTORE_COLLECTION]
+    collection = get_vector_collection()
     
     print("\n" + "="*80)
     print("COMPARING EMBEDDINGS: BLOG vs SHAREPOINT")
     print("="*80 + "\n")
     
-    # Get a blog document
-    blog_doc = collection.find_one({"metadata.source": "cloudfuze_blog"})
-    
-    # Get a SharePoint document
-    sharepoint_doc = collection.find_one({"metadata.source": "cloudfuze_doc360"})
+    blog_source = "cloudfuze_blog"
+    sharepoint_source = "cloudfuze_doc360"
+    
+    # Only the fields shown below: the body is cut to its 200-char preview and the
+    # embedding to its type, length and first 5 values, all server-side
+    sample_projection = {
+        "metadata.source": 1,
+        "metadata.page_title": 1,
+        "text": {"$substrCP": [{"$ifNull": ["$text", ""]}, 0, 200]},
+        "embedding_type": {"$type": "$embedding"},
+        "embedding_len": {"$size": {"$ifNull": ["$embedding", []]}},
+        "embedding_head": {"$slice": [{"$ifNull": ["$embedding", []]}, 5]},
+    }
+    
+    # Both samples in one round trip. $unionWith (unlike $facet) lets each
+    # branch's $match use the metadata.source index and stop at its first hit
+    def sample_pipeline(source):
+        return [
+            {"$match": {"metadata.source": source}},
+            {"$limit": 1},
+            {"$project": sample_projection},
+        ]
+    
+    samples = {
+        doc["metadata"]["source"]: doc
+        for doc in collection.aggregate(
+            sample_pipeline(blog_source)
+            + [{"$unionWith": {"coll": collection.name, "pipeline": sample_pipeline(sharepoint_source)}}]
+        )
+    }
+    blog_doc = samples.get(blog_source)
+    sharepoint_doc = samples.get(sharepoint_source)
     
     if not blog_doc:
         print("❌ No blog documents found")
@@ -36,45 +97,48 @@ def compare_embeddings():
     print("✅ Found both blog and SharePoint documents\n")
     
     # Check embeddings
-    blog_embedding = blog_doc.get('embedding')
-    sharepoint_embedding = sharepoint_doc.get('embedding')
+    blog_has_embedding = blog_doc['embedding_type'] == 'array'
+    sharepoint_has_embedding = sharepoint_doc['embedding_type'] == 'array'
     
     print("BLOG CONTENT:")
     print(f"  Source: {blog_doc.get('metadata', {}).get('source')}")
-    print(f"  Has embedding: {blog_embedding is not None}")
-    if blog_embedding:
-        print(f"  Embedding type: {type(blog_embedding)}")
-        print(f"  Embedding dimensions: {len(blog_embedding)}")
-        print(f"  First 5 values: {blog_embedding[:5]}")
+    print(f"  Has embedding: {blog_has_embedding}")
+    if blog_has_embedding:
+        print(f"  Embedding type: {blog_doc['embedding_type']}")
+        print(f"  Embedding dimensions: {blog_doc['embedding_len']}")
+        print(f"  First 5 values: {blog_doc['embedding_head']}")
     
     print("\nSHAREPOINT CONTENT:")
     print(f"  Source: {sharepoint_doc.get('metadata', {}).get('source')}")
     print(f"  Page title: {sharepoint_doc.get('metadata', {}).get('page_title', 'N/A')}")
-    print(f"  Has embedding: {sharepoint_embedding is not None}")
-    if sharepoint_embedding:
-        print(f"  Embedding type: {type(sharepoint_embedding)}")
-        print(f"  Embedding dimensions: {len(sharepoint_embedding)}")
-        print(f"  First 5 values: {sharepoint_embedding[:5]}")
+    print(f"  Has embedding: {sharepoint_has_embedding}")
+    if sharepoint_has_embedding:
+        print(f"  Embedding type: {sharepoint_doc['embedding_type']}")
+        print(f"  Embedding dimensions: {sharepoint_doc['embedding_len']}")
+        print(f"  First 5 values: {sharepoint_doc['embedding_head']}")
     
     # Compare
     print(f"\n{'='*80}")
     print("COMPARISON:")
     print(f"{'='*80}")
     
-    if blog_embedding and sharepoint_embedding:
-        if len(blog_embedding) == len(sharepoint_embedding):
-            print(f"✅ SAME DIMENSIONS: Both use {len(blog_embedding)}-dimensional embeddings")
+    if blog_has_embedding and sharepoint_has_embedding:
+        if blog_doc['embedding_len'] == sharepoint_doc['embedding_len']:
+            print(f"✅ SAME DIMENSIONS: Both use {blog_doc['embedding_len']}-dimensional embeddings")
         else:
             print(f"❌ DIFFERENT DIMENSIONS:")
-            print(f"   Blog: {len(blog_embedding)}")
-            print(f"   SharePoint: {len(sharepoint_embedding)}")
+            print(f"   Blog: {blog_doc['embedding_len']}")
+            print(f"   SharePoint: {sharepoint_doc['embedding_len']}")
         
-        if type(blog_embedding) == type(sharepoint_embedding):
-            print(f"✅ SAME TYPE: Both use {type(blog_embedding).__name__}")
+        # Compare the element types too (e.g. double vs int), not just "array"
+        blog_value_types = {type(v).__name__ for v in blog_doc['embedding_head']}
+        sharepoint_value_types = {type(v).__name__ for v in sharepoint_doc['embedding_head']}
+        if blog_value_types == sharepoint_value_types:
+            print(f"✅ SAME TYPE: Both use {', '.join(sorted(blog_value_types))} values")
         else:
             print(f"❌ DIFFERENT TYPES:")
-            print(f"   Blog: {type(blog_embedding).__name__}")
-            print(f"   SharePoint: {type(sharepoint_embedding).__name__}")
+            print(f"   Blog: {', '.join(sorted(blog_value_types))}")
+            print(f"   SharePoint: {', '.join(sorted(sharepoint_value_types))}")
     
     # Check sample content
     print(f"\n{'='*80}")
@@ -92,14 +156,31 @@ def compare_embeddings():
     print("DOCUMENT COUNTS:")
     print(f"{'='*80}")
     
-    blog_count = collection.count_documents({"metadata.source": "cloudfuze_blog"})
-    sharepoint_count = collection.count_documents({"metadata.source": "cloudfuze_doc360"})
-    total_count = collection.count_documents({})
+    # Per-source counts are answered from the metadata.source index (no
+    # document scan); the total comes from collection metadata
+    blog_count = collection.count_documents({"metadata.source": blog_source})
+    sharepoint_count = collection.count_documents({"metadata.source": sharepoint_source})
+    total_count = collection.estimated_document_count()
     
     print(f"  Blog documents: {blog_count}")
     print(f"  SharePoint documents: {sharepoint_count}")
     print(f"  Total documents: {total_count}")
     
+    # Similarity audit over a sample of each source
+    print(f"\n{'='*80}")
+    print(f"SIMILARITY AUDIT (up to {AUDIT_SAMPLE_SIZE} embeddings per source):")
+    print(f"{'='*80}")
+    
+    blog_matrix = load_normalized_embeddings(collection, blog_source)
+    sharepoint_matrix = load_normalized_embeddings(collection, sharepoint_source)
+    
+    if blog_matrix.size and sharepoint_matrix.size and blog_matrix.shape[1] == sharepoint_matrix.shape[1]:
+        print(f"  Blog vs blog:             {mean_cosine(blog_matrix, blog_matrix, same_rows=True):.4f}")
+        print(f"  SharePoint vs SharePoint: {mean_cosine(sharepoint_matrix, sharepoint_matrix, same_rows=True):.4f}")
+        print(f"  Blog vs SharePoint:       {mean_cosine(blog_matrix, sharepoint_matrix):.4f}")
+    else:
+        print("  Skipped: need same-dimension embeddings from both sources")
+    
     print(f"\n{'='*80}\n")
 
 if __name__ == "__main__":
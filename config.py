@@ -104,6 +104,9 @@ VECTORSTORE_BACKEND = os.getenv("VECTORSTORE_BACKEND", "mongodb").lower()
 # Convert to boolean: only "true" (case-insensitive) enables initialization
 INITIALIZE_VECTORSTORE = os.getenv("INITIALIZE_VECTORSTORE", "false").lower() == "true"
 
+# Write vectorstore_metadata.json pretty-printed (debugging only; compact by default)
+VECTORSTORE_METADATA_PRETTY = os.getenv("VECTORSTORE_METADATA_PRETTY", "false").lower() == "true"
+
 # Individual Source Control - Enable/Disable specific data sources
 # Set to "true" to enable, "false" to disable
 # Convert to boolean: only "true" (case-insensitive) enables the source
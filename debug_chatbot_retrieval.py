@@ -1,13 +1,9 @@
 """
 Debug what the chatbot is actually retrieving and seeing
 """
-from dotenv import load_dotenv
-load_dotenv()
-
-from langchain_openai import OpenAIEmbeddings
-from app.mongodb_vectorstore import MongoDBVectorStore
-from config import MONGODB_VECTORSTORE_COLLECTION, SYSTEM_PROMPT
-import os
+from collections import Counter
+from check_common import get_vectorstore
+from config import SYSTEM_PROMPT
 
 def debug_retrieval():
     """Debug the full retrieval and formatting process."""
@@ -18,16 +14,8 @@ def debug_retrieval():
     
     question = "What are Multi User Golden Image Combinations?"
     
-    # Initialize embeddings and vectorstore (same as chatbot)
-    embeddings = OpenAIEmbeddings(
-        model="text-embedding-3-small",
-        openai_api_key=os.getenv("OPENAI_API_KEY")
-    )
-    
-    vectorstore = MongoDBVectorStore(
-        collection_name=MONGODB_VECTORSTORE_COLLECTION,
-        embedding_function=embeddings
-    )
+    # Shared embeddings and vectorstore (same as chatbot)
+    vectorstore = get_vectorstore()
     
     print(f"Question: {question}\n")
     print("="*80)
@@ -84,18 +72,39 @@ def debug_retrieval():
     print("ANALYSIS")
     print("="*80 + "\n")
     
-    sharepoint_docs = [d for d in docs if d.metadata.get('source') == 'cloudfuze_doc360']
-    blog_docs = [d for d in docs if d.metadata.get('source') == 'cloudfuze_blog']
+    # Tally every source in one pass
+    source_counts = Counter(d.metadata.get('source') for d in docs)
+    sharepoint_count = source_counts['cloudfuze_doc360']
     
-    print(f"SharePoint documents retrieved: {len(sharepoint_docs)}")
-    print(f"Blog documents retrieved: {len(blog_docs)}")
+    print(f"SharePoint documents retrieved: {sharepoint_count}")
+    print(f"Blog documents retrieved: {source_counts['cloudfuze_blog']}")
     
-    if len(sharepoint_docs) > 0:
+    if sharepoint_count > 0:
         print("\n✅ SharePoint content IS being retrieved!")
         print("   The issue is likely in how the LLM interprets the content.")
     else:
         print("\n❌ SharePoint content is NOT being retrieved!")
         print("   The issue is in the similarity search.")
+    
+    print("\n" + "="*80)
+    print("SOURCE DISTRIBUTION IN TOP 100")
+    print("="*80 + "\n")
+    
+    # Metadata only - the 100 chunk bodies are never fetched
+    top_metadata = vectorstore.similarity_search_metadata(question, k=100)
+    top_counts = Counter(metadata.get('source_type', 'Unknown') for metadata, _ in top_metadata)
+    for source_type, count in top_counts.most_common():
+        print(f"  {source_type}: {count}")
+    
+    first_sharepoint = next(
+        (rank for rank, (metadata, _) in enumerate(top_metadata, 1)
+         if metadata.get('source') == 'cloudfuze_doc360'),
+        None
+    )
+    if first_sharepoint:
+        print(f"\nFirst SharePoint result at rank {first_sharepoint}")
+    else:
+        print("\nNo SharePoint result in the top 100")
 
 if __name__ == "__main__":
     debug_retrieval()
@@ -2,100 +2,111 @@
 Enrich SharePoint documents with better searchable content
 by adding page titles and context to the text content.
 """
-from pymongo import MongoClient
-from langchain_openai import OpenAIEmbeddings
-from config import MONGODB_URL, MONGODB_DATABASE, MONGODB_VECTORSTORE_COLLECTION
-from dotenv import load_dotenv
-import os
+from check_common import get_vector_collection, get_embeddings
+from app.mongodb_vectorstore import mark_vectors_changed
 
-load_dotenv()
+# Documents read and re-embedded per batch (one embeddings API call each)
+ENRICH_BATCH_SIZE = 50
 
 def enrich_sharepoint_documents():
     """Add page titles and context to SharePoint documents to improve retrieval."""
     
-    client = MongoClient(MONGODB_URL)
-    db = client[MONGODB_DATABASE]
-    collection = db[MONGODB_VECTORSTORE_COLLECTION]
+    collection = get_vector_collection()
     
     print("\n" + "="*80)
     print("ENRICHING SHAREPOINT DOCUMENTS WITH METADATA")
     print("="*80 + "\n")
     
-    # Initialize embeddings for re-embedding
-    embeddings = OpenAIEmbeddings(
-        model="text-embedding-3-small",
-        openai_api_key=os.getenv("OPENAI_API_KEY")
-    )
+    # Shared embeddings client for re-embedding
+    embeddings = get_embeddings()
     
     # Find all SharePoint documents
-    sharepoint_docs = list(collection.find({
-        "metadata.source": "cloudfuze_doc360"
-    }))
+    sharepoint_filter = {"metadata.source": "cloudfuze_doc360"}
+    total_docs = collection.count_documents(sharepoint_filter)
     
-    print(f"Found {len(sharepoint_docs)} SharePoint documents to enrich\n")
+    print(f"Found {total_docs} SharePoint documents to enrich\n")
     
     updated_count = 0
     
-    for doc in sharepoint_docs:
-        doc_id = doc['_id']
-        current_text = doc.get('text', '')
-        metadata = doc.get('metadata', {})
-        page_title = metadata.get('page_title', '')
-        page_url = metadata.get('page_url', '')
-        
-        # Check if already enriched
-        if current_text.startswith("# "):
-            print(f"  [SKIP] Already enriched: {page_title[:50]}...")
-            continue
-        
-        # Create enriched content
-        # Add page title and context at the beginning
-        enriched_content_parts = []
-        
-        # Add title as heading
-        if page_title:
-            # Clean up the title (remove "DOC 360 - " prefix if present)
-            clean_title = page_title.replace("DOC 360 - ", "").strip()
-            enriched_content_parts.append(f"# {clean_title}")
-            enriched_content_parts.append("")  # blank line
-        
-        # Add context about the document type
-        doc_type = "CloudFuze Migration Documentation"
-        enriched_content_parts.append(f"**Document Type:** {doc_type}")
-        enriched_content_parts.append("")
-        
-        # Add the original content
-        enriched_content_parts.append(current_text)
-        
-        # Combine everything
-        enriched_text = "\n".join(enriched_content_parts)
+    # Collect the ids up front: the documents are then read and re-embedded in
+    # small batches, so no cursor sits idle on the server during the embedding calls
+    doc_ids = [doc['_id'] for doc in collection.find(sharepoint_filter, {"_id": 1})]
+    
+    for start in range(0, len(doc_ids), ENRICH_BATCH_SIZE):
+        batch_ids = doc_ids[start:start + ENRICH_BATCH_SIZE]
+        # Skip the stored embeddings: they are most of each document's size and unused here
+        batch_docs = list(collection.find({"_id": {"$in": batch_ids}}, {"text": 1, "metadata": 1}))
         
-        # Re-generate embedding
-        try:
-            new_embedding = embeddings.embed_query(enriched_text)
+        pending = []
+        for doc in batch_docs:
+            current_text = doc.get('text', '')
+            page_title = doc.get('metadata', {}).get('page_title', '')
             
-            # Update the document
-            collection.update_one(
-                {'_id': doc_id},
-                {
-                    '$set': {
-                        'text': enriched_text,
-                        'embedding': new_embedding
-                    }
-                }
-            )
+            # Check if already enriched
+            if current_text.startswith("# "):
+                print(f"  [SKIP] Already enriched: {page_title[:50]}...")
+                continue
+            
+            # Create enriched content
+            # Add page title and context at the beginning
+            enriched_content_parts = []
             
-            updated_count += 1
-            print(f"  [✓] Enriched: {page_title[:60]}... ({len(current_text)} → {len(enriched_text)} chars)")
+            # Add title as heading
+            if page_title:
+                # Clean up the title (remove "DOC 360 - " prefix if present)
+                clean_title = page_title.replace("DOC 360 - ", "").strip()
+                enriched_content_parts.append(f"# {clean_title}")
+                enriched_content_parts.append("")  # blank line
             
+            # Add context about the document type
+            doc_type = "CloudFuze Migration Documentation"
+            enriched_content_parts.append(f"**Document Type:** {doc_type}")
+            enriched_content_parts.append("")
+            
+            # Add the original content
+            enriched_content_parts.append(current_text)
+            
+            # Combine everything
+            pending.append((doc['_id'], page_title, current_text, "\n".join(enriched_content_parts)))
+        
+        if not pending:
+            continue
+        
+        # Re-generate the batch's embeddings in one API call
+        try:
+            new_embeddings = embeddings.embed_documents([enriched_text for _, _, _, enriched_text in pending])
         except Exception as e:
-            print(f"  [✗] Failed to enrich {page_title}: {e}")
+            print(f"  [✗] Failed to enrich {len(pending)} documents: {e}")
+            continue
+        
+        for (doc_id, page_title, current_text, enriched_text), new_embedding in zip(pending, new_embeddings):
+            try:
+                # Update the document
+                collection.update_one(
+                    {'_id': doc_id},
+                    {
+                        '$set': {
+                            'text': enriched_text,
+                            'embedding': new_embedding
+                        }
+                    }
+                )
+                
+                updated_count += 1
+                print(f"  [✓] Enriched: {page_title[:60]}... ({len(current_text)} → {len(enriched_text)} chars)")
+                
+            except Exception as e:
+                print(f"  [✗] Failed to enrich {page_title}: {e}")
+    
+    # Rewritten embeddings keep the document count and newest _id, so flag the change explicitly
+    if updated_count:
+        mark_vectors_changed(collection)
     
     print(f"\n{'='*80}")
     print(f"ENRICHMENT COMPLETE")
     print(f"{'='*80}")
     print(f"✅ Updated {updated_count} documents")
-    print(f"✅ Skipped {len(sharepoint_docs) - updated_count} already enriched documents")
+    print(f"✅ Skipped {total_docs - updated_count} already enriched documents")
     print(f"\n🚀 SharePoint documents now have better context for retrieval!")
 
 if __name__ == "__main__":
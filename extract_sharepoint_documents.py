@@ -18,6 +18,7 @@ import os
 import sys
 import json
 import hashlib
+from collections import defaultdict
 from datetime import datetime
 from typing import List, Dict, Any
 from dotenv import load_dotenv
@@ -34,6 +35,7 @@ from app.sharepoint_document_crawler import get_sharepoint_crawler
 from app.sharepoint_page_crawler import get_sharepoint_page_crawler
 from app.sharepoint_file_processor import SharePointFileProcessor
 from app.mongodb_vectorstore import MongoDBVectorStore
+from app.vectorstore import delete_app_vectors
 from config import (
     MONGODB_VECTORSTORE_COLLECTION,
     EXTRACT_SHAREPOINT_PAGES,
@@ -55,6 +57,9 @@ class SharePointExtractor:
         # Load processing log
         self.processing_log = self._load_processing_log()
         
+        # URLs with a logged version, so update checks are a set lookup
+        self.logged_urls = {entry.get('sharepoint_url') for entry in self.processing_log.values()}
+        
         # Statistics
         self.stats = {
             "start_time": datetime.now().isoformat(),
@@ -110,10 +115,8 @@ class SharePointExtractor:
             return False, f"Already processed (up to date)"
         
         # Check if an older version exists
-        file_url = file_metadata['sharepoint_url']
-        for existing_hash, log_entry in self.processing_log.items():
-            if log_entry.get('sharepoint_url') == file_url:
-                return True, f"File updated (will replace old version)"
+        if file_metadata['sharepoint_url'] in self.logged_urls:
+            return True, f"File updated (will replace old version)"
         
         # New file
         return True, "New file"
@@ -134,13 +137,11 @@ class SharePointExtractor:
                 "metadata.file_name": file_name
             }
             
-            # Count existing chunks
-            existing_count = vectorstore.collection.count_documents(query)
+            # Delete by filter directly - no separate count round trip
+            removed_count = delete_app_vectors(vectorstore, query)
             
-            if existing_count > 0:
-                print(f"[*] Found {existing_count} existing chunks for {file_name}, removing...")
-                vectorstore.collection.delete_many(query)
-                print(f"[OK] Removed {existing_count} old chunks")
+            if removed_count > 0:
+                print(f"[OK] Removed {removed_count} old chunks for {file_name}")
                 self.stats['files_updated'] += 1
             
         except Exception as e:
@@ -323,17 +324,16 @@ class SharePointExtractor:
             )
             
             # Group documents by file for batch processing
-            files_docs = {}
+            # (keyed by URL and name so same-named files in different folders stay separate)
+            files_docs = defaultdict(list)
             for doc in documents:
-                file_name = doc.metadata.get('file_name', 'unknown')
-                if file_name not in files_docs:
-                    files_docs[file_name] = []
-                files_docs[file_name].append(doc)
+                metadata = doc.metadata
+                files_docs[(metadata.get('sharepoint_url', ''), metadata.get('file_name', 'unknown'))].append(doc)
             
             # Process each file
             total_stored = 0
             
-            for file_name, file_docs in files_docs.items():
+            for (_, file_name), file_docs in files_docs.items():
                 print(f"\n[*] Storing {len(file_docs)} chunks from {file_name}...")
                 
                 # Remove old chunks if file was updated
@@ -348,9 +348,11 @@ class SharePointExtractor:
                     
                     # Update processing log
                     file_hash = self._get_file_hash(file_docs[0].metadata)
+                    file_url = file_docs[0].metadata.get('sharepoint_url', '')
+                    self.logged_urls.add(file_url)
                     self.processing_log[file_hash] = {
                         'file_name': file_name,
-                        'sharepoint_url': file_docs[0].metadata.get('sharepoint_url', ''),
+                        'sharepoint_url': file_url,
                         'last_modified': file_docs[0].metadata.get('last_modified', ''),
                         'chunks_stored': len(doc_ids),
                         'processed_at': datetime.now().isoformat()
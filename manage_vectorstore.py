@@ -68,16 +68,13 @@ def rebuild_vectorstore():
         return
     
     try:
-        from app.vectorstore import rebuild_vectorstore_if_needed, save_metadata, get_current_metadata
+        from app.vectorstore import rebuild_vectorstore_if_needed
         
         print("Starting vectorstore rebuild...")
+        # Metadata is saved by rebuild_vectorstore_if_needed itself
         vectorstore = rebuild_vectorstore_if_needed()
         
         if vectorstore:
-            # Save metadata
-            current_metadata = get_current_metadata()
-            save_metadata(current_metadata)
-            
             total_docs = vectorstore._collection.count()
             print(f"✅ Vectorstore rebuilt successfully!")
             print(f"Total documents: {total_docs}")
@@ -154,7 +154,8 @@ def migrate_chromadb_to_mongodb(
                 embeddings_list = page.get('embeddings')
 
                 if not texts:
-                    continue
+                    # Past the end of the collection (count can shrink during migration)
+                    break
 
                 # If embeddings are missing (rare), regenerate them to avoid failure
                 if embeddings_list is None:
@@ -190,8 +191,8 @@ def migrate_chromadb_to_mongodb(
                 print(f"[WARNING] Batch {batch_num + 1} failed (offset {offset}): {e}")
                 # Fallback: try per-document to skip corrupt entries
                 try:
-                    # Attempt to fetch ids for this window (ids are always returned)
-                    page_ids = collection.get(limit=batch_size, offset=offset).get('ids', [])
+                    # Attempt to fetch ids for this window (ids are always returned, skip everything else)
+                    page_ids = collection.get(limit=batch_size, offset=offset, include=[]).get('ids', [])
                     for doc_id in page_ids:
                         try:
                             item = collection.get(ids=[doc_id], include=['documents', 'metadatas', 'embeddings'])
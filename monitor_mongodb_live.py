@@ -25,13 +25,22 @@ def get_collection_stats(db):
         'bad_responses'
     ]
     
+    # The vector store's latest chunk is fetched every refresh, so skip its
+    # embedding and full text and fetch just what is displayed
+    projections = {
+        'cloudfuze_vectorstore': {
+            'text_preview': {'$substrCP': [{'$ifNull': ['$text', '']}, 0, 50]},
+            'metadata.source': 1,
+        },
+    }
+    
     stats = {}
     for coll_name in collections_to_monitor:
         coll = db[coll_name]
-        count = coll.count_documents({})
+        count = coll.estimated_document_count()
         
         # Get latest document
-        latest = coll.find_one(sort=[('_id', -1)])
+        latest = coll.find_one({}, projections.get(coll_name), sort=[('_id', -1)])
         
         stats[coll_name] = {
             'count': count,
@@ -106,7 +115,7 @@ def display_stats(stats, previous_stats):
                 
             elif coll_name == 'cloudfuze_vectorstore':
                 print(f"   🔍 Vector Store:")
-                print(f"      • Document: {latest.get('document', 'N/A')[:50]}...")
+                print(f"      • Document: {latest.get('text_preview', 'N/A')}...")
                 metadata = latest.get('metadata', {})
                 print(f"      • Source: {metadata.get('source', 'N/A')}")
                 
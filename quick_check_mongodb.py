@@ -18,7 +18,7 @@ print(f"\n✓ Config: VECTORSTORE_BACKEND = '{VECTORSTORE_BACKEND}'")
 # 2. Load vectorstore
 from app.vectorstore import vectorstore
 if vectorstore:
-    vectorstore_type = type(vectorstore).__name__
+    vectorstore_type = type(vectorstore.resolve()).__name__
     print(f"✓ Loaded: {vectorstore_type}")
     
     if "MongoDB" in vectorstore_type:
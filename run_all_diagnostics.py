@@ -0,0 +1,145 @@
+"""
+Run the read-only vector store diagnostics together.
+
+Each check runs in its own process (so their output can't interleave) and the
+processes run concurrently - the checks are I/O-bound on MongoDB and the
+embeddings API, so the batch takes about as long as the slowest check instead
+of the sum of all of them. Output is printed in the order listed below.
+
+With --in-process the checks run one after another inside this interpreter
+instead, so imported modules and their cached handles are set up once rather
+than once per check. The checks built on check_common share its MongoDB
+client, embeddings client and vector store; the ones that load the app's
+store (app.vectorstore) share that store and its in-memory index. The two
+stores use different embedding models, so they are not merged.
+
+Usage:
+    python run_all_diagnostics.py                  # run every check
+    python run_all_diagnostics.py compare          # run checks whose name contains "compare"
+    python run_all_diagnostics.py --in-process     # run sequentially, sharing clients
+"""
+import argparse
+import contextlib
+import io
+import os
+import runpy
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DIAGNOSTICS = [
+    "quick_check_mongodb.py",
+    "check_sharepoint_in_vectorstore.py",
+    "check_sharepoint_page_quality.py",
+    "compare_embeddings.py",
+    "debug_chatbot_retrieval.py",
+]
+
+MAX_WORKERS = 8
+
+# The checks only read the store; never let them (re)build it, least of all concurrently
+DIAGNOSTIC_ENV = {"PYTHONIOENCODING": "utf-8", "INITIALIZE_VECTORSTORE": "false"}
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_diagnostic(script: str) -> dict:
+    """Run one diagnostic script and capture its output."""
+    start = time.time()
+    result = subprocess.run(
+        [sys.executable, script],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        env={**os.environ, **DIAGNOSTIC_ENV},
+    )
+    return {
+        "script": script,
+        "returncode": result.returncode,
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+        "duration": time.time() - start,
+    }
+
+
+def _capture_stream() -> io.TextIOWrapper:
+    """In-memory text stream that, unlike StringIO, supports reconfigure() like sys.stdout."""
+    return io.TextIOWrapper(io.BytesIO(), encoding="utf-8", errors="replace")
+
+
+def _captured_text(stream: io.TextIOWrapper) -> str:
+    stream.flush()
+    return stream.buffer.getvalue().decode("utf-8", errors="replace")
+
+
+def run_diagnostic_in_process(script: str) -> dict:
+    """Run one diagnostic script in this interpreter and capture its output."""
+    start = time.time()
+    stdout, stderr = _capture_stream(), _capture_stream()
+    returncode = 0
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            runpy.run_path(os.path.join(BASE_DIR, script), run_name="__main__")
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+    return {
+        "script": script,
+        "returncode": returncode,
+        "stdout": _captured_text(stdout),
+        "stderr": _captured_text(stderr),
+        "duration": time.time() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the vector store diagnostics.")
+    parser.add_argument("patterns", nargs="*", help="only run checks whose file name contains one of these")
+    parser.add_argument("--in-process", action="store_true",
+                        help="run sequentially in this process, sharing MongoDB/embeddings clients")
+    args = parser.parse_args()
+
+    selected = [s for s in DIAGNOSTICS if not args.patterns or any(p in s for p in args.patterns)]
+    if not selected:
+        print(f"No diagnostics match {args.patterns}. Available: {', '.join(DIAGNOSTICS)}")
+        return 1
+
+    start = time.time()
+    if args.in_process:
+        # Scripts import check_common/app modules relative to the repo root
+        sys.path.insert(0, BASE_DIR)
+        # config reads INITIALIZE_VECTORSTORE at import, so set it before any check runs
+        os.environ["INITIALIZE_VECTORSTORE"] = DIAGNOSTIC_ENV["INITIALIZE_VECTORSTORE"]
+        results = [run_diagnostic_in_process(script) for script in selected]
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(selected))) as pool:
+            results = list(pool.map(run_diagnostic, selected))
+
+    for res in results:
+        print("\n" + "=" * 70)
+        print(f"{res['script']}  ({res['duration']:.1f}s, exit {res['returncode']})")
+        print("=" * 70)
+        print(res["stdout"], end="")
+        if res["returncode"] != 0 and res["stderr"]:
+            print(res["stderr"], end="")
+
+    failed = [res["script"] for res in results if res["returncode"] != 0]
+    print("\n" + "=" * 70)
+    print(f"Ran {len(results)} diagnostics in {time.time() - start:.1f}s")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+    print("=" * 70)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -50,7 +50,6 @@ import json
 import os
 import sys
 import glob
-import hashlib
 import argparse
 import time
 import shutil
@@ -122,7 +121,7 @@ def convert_langfuse_to_openai_format(langfuse_file: str) -> Tuple[List[Dict], D
     training_data = []
     skipped_count = 0
     invalid_count = 0
-    seen_hashes = set()
+    seen_pairs = set()
     
     with open(langfuse_file, 'r', encoding='utf-8') as f:
         for line_num, line in enumerate(f, 1):
@@ -142,12 +141,12 @@ def convert_langfuse_to_openai_format(langfuse_file: str) -> Tuple[List[Dict], D
                     invalid_count += 1
                     continue
                 
-                # Check for duplicates
-                content_hash = hashlib.md5(f"{input_text}|||{expected_output}".encode()).hexdigest()
-                if content_hash in seen_hashes:
+                # Check for duplicates (the pair itself is the key; the strings are kept anyway)
+                pair = (str(input_text), str(expected_output))
+                if pair in seen_pairs:
                     skipped_count += 1
                     continue
-                seen_hashes.add(content_hash)
+                seen_pairs.add(pair)
                 
                 # Convert to OpenAI format
                 training_example = {
@@ -191,7 +190,7 @@ def load_standard_corrections() -> Tuple[List[Dict], Dict]:
     print(f"\n[*] Loading from standard corrections format...")
     
     all_corrections = []
-    seen_hashes = set()
+    seen_pairs = set()
     invalid_count = 0
     duplicates_count = 0
     
@@ -213,14 +212,12 @@ def load_standard_corrections() -> Tuple[List[Dict], Dict]:
                         continue
                     
                     # Check for duplicates
-                    content_hash = hashlib.md5(
-                        f"{correction['input']}|||{correction['corrected_output']}".encode()
-                    ).hexdigest()
+                    pair = (str(correction['input']), str(correction['corrected_output']))
                     
-                    if content_hash in seen_hashes:
+                    if pair in seen_pairs:
                         duplicates_count += 1
                         continue
-                    seen_hashes.add(content_hash)
+                    seen_pairs.add(pair)
                     
                     all_corrections.append(correction)
                     
@@ -242,11 +239,9 @@ def load_standard_corrections() -> Tuple[List[Dict], Dict]:
                     try:
                         correction = json.loads(line.strip())
                         if 'input' in correction and 'corrected_output' in correction:
-                            content_hash = hashlib.md5(
-                                f"{correction['input']}|||{correction['corrected_output']}".encode()
-                            ).hexdigest()
-                            if content_hash not in seen_hashes:
-                                seen_hashes.add(content_hash)
+                            pair = (str(correction['input']), str(correction['corrected_output']))
+                            if pair not in seen_pairs:
+                                seen_pairs.add(pair)
                                 all_corrections.append(correction)
                             else:
                                 duplicates_count += 1
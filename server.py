@@ -14,6 +14,10 @@ import os
 async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     # Startup
+    # Load the vectorstore up front so the first chat request doesn't pay for it
+    from app.vectorstore import vectorstore
+    await asyncio.to_thread(vectorstore.resolve)
+    
     from app.mongodb_memory import mongodb_memory
     try:
         await mongodb_memory.connect()
@@ -6,12 +6,17 @@ This script verifies that the MongoDB vector store is working correctly.
 
 import os
 import sys
-from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
 
 from app.mongodb_vectorstore import MongoDBVectorStore
+from check_common import get_embeddings, get_vectorstore
 from config import MONGODB_VECTORSTORE_COLLECTION
 
+TEST_COLLECTION = f"{MONGODB_VECTORSTORE_COLLECTION}_test"
+
+# Embed with the OpenAIEmbeddings default, like the app's store
+EMBEDDING_MODEL = None
+
 
 def test_basic_operations():
     """Test basic vector store operations."""
@@ -21,11 +26,7 @@ def test_basic_operations():
     
     # Initialize
     print("[*] Initializing MongoDB vector store...")
-    embeddings = OpenAIEmbeddings()
-    vectorstore = MongoDBVectorStore(
-        collection_name=f"{MONGODB_VECTORSTORE_COLLECTION}_test",
-        embedding_function=embeddings,
-    )
+    vectorstore = get_vectorstore(TEST_COLLECTION, model=EMBEDDING_MODEL)
     print("[OK] Vector store initialized")
     
     # Clear any existing test data
@@ -101,11 +102,7 @@ def test_retriever_interface():
     
     # Initialize
     print("[*] Initializing MongoDB vector store...")
-    embeddings = OpenAIEmbeddings()
-    vectorstore = MongoDBVectorStore(
-        collection_name=f"{MONGODB_VECTORSTORE_COLLECTION}_test",
-        embedding_function=embeddings,
-    )
+    vectorstore = get_vectorstore(TEST_COLLECTION, model=EMBEDDING_MODEL)
     
     # Add test data
     print("[*] Adding test data...")
@@ -141,7 +138,7 @@ def test_from_texts():
     print("=" * 70)
     
     print("[*] Creating vector store from texts...")
-    embeddings = OpenAIEmbeddings()
+    embeddings = get_embeddings(EMBEDDING_MODEL)
     
     texts = [
         "CloudFuze provides SaaS migration services.",
@@ -156,7 +153,7 @@ def test_from_texts():
         texts=texts,
         embedding=embeddings,
         metadatas=metadatas,
-        collection_name=f"{MONGODB_VECTORSTORE_COLLECTION}_test",
+        collection_name=TEST_COLLECTION,
     )
     
     stats = vectorstore.get_collection_stats()
@@ -173,6 +170,27 @@ def test_from_texts():
     return True
 
 
+def test_empty_collection_search():
+    """Test that searching an empty collection returns no results."""
+    print("\n" + "=" * 70)
+    print("TEST 4: Search Empty Collection")
+    print("=" * 70)
+    
+    vectorstore = get_vectorstore(TEST_COLLECTION, model=EMBEDDING_MODEL)
+    vectorstore.clear()
+    
+    # Search by a fixed vector so no embeddings API call is needed
+    results = vectorstore.similarity_search_by_vector([1.0] * 1536, k=3)
+    print(f"[OK] Search returned {len(results)} results")
+    
+    if results:
+        print("[ERROR] Expected no results from an empty collection")
+        return False
+    
+    print("\n✅ Empty collection search test passed!")
+    return True
+
+
 def test_mongodb_connection():
     """Test MongoDB connection."""
     print("\n" + "=" * 70)
@@ -234,6 +252,11 @@ def main():
             print("\n❌ From texts test failed")
             return False
         
+        # Test 4: Empty collection
+        if not test_empty_collection_search():
+            print("\n❌ Empty collection search test failed")
+            return False
+        
         print("\n" + "=" * 70)
         print("✅ ALL TESTS PASSED!")
         print("=" * 70)
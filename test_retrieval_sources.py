@@ -1,33 +1,16 @@
 """
 Test which sources are being retrieved for SharePoint questions
 """
-from langchain_openai import OpenAIEmbeddings
-from app.mongodb_vectorstore import MongoDBVectorStore
-from config import MONGODB_VECTORSTORE_COLLECTION
-from dotenv import load_dotenv
-import os
+from check_common import get_embeddings, get_vectorstore
 
-load_dotenv()
-
-def test_retrieval(query):
+def test_retrieval(vectorstore, query, query_embedding):
     """Test what documents are retrieved for a query."""
     print(f"\n{'='*80}")
     print(f"Query: {query}")
     print(f"{'='*80}\n")
     
-    # Initialize embeddings and vectorstore
-    embeddings = OpenAIEmbeddings(
-        model="text-embedding-3-small",
-        openai_api_key=os.getenv("OPENAI_API_KEY")
-    )
-    
-    vectorstore = MongoDBVectorStore(
-        collection_name=MONGODB_VECTORSTORE_COLLECTION,
-        embedding_function=embeddings
-    )
-    
     # Retrieve top 5 documents
-    results = vectorstore.similarity_search(query, k=5)
+    results = vectorstore.similarity_search_by_vector(query_embedding, k=5)
     
     print(f"Retrieved {len(results)} documents:\n")
     
@@ -53,6 +36,13 @@ queries = [
     "Message migration combinations"
 ]
 
-for query in queries:
-    test_retrieval(query)
+# Shared embeddings and vectorstore for all queries
+embeddings = get_embeddings()
+vectorstore = get_vectorstore()
+
+# Embed every query in a single API call
+query_embeddings = embeddings.embed_documents(queries)
+
+for query, query_embedding in zip(queries, query_embeddings):
+    test_retrieval(vectorstore, query, query_embedding)
 
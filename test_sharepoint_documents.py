@@ -14,6 +14,7 @@ Validates that:
 
 import os
 import sys
+from collections import Counter
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -22,10 +23,12 @@ load_dotenv()
 # Add app directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from langchain_openai import OpenAIEmbeddings
-from app.mongodb_vectorstore import MongoDBVectorStore
+from check_common import get_vectorstore
 from config import MONGODB_VECTORSTORE_COLLECTION
 
+# These tests query the app's store, which embeds with the OpenAIEmbeddings default
+EMBEDDING_MODEL = None
+
 
 def test_mongodb_connection():
     """Test connection to MongoDB vector store."""
@@ -34,11 +37,7 @@ def test_mongodb_connection():
     print("=" * 70)
     
     try:
-        embeddings = OpenAIEmbeddings()
-        vectorstore = MongoDBVectorStore(
-            collection_name=MONGODB_VECTORSTORE_COLLECTION,
-            embedding_function=embeddings
-        )
+        vectorstore = get_vectorstore(model=EMBEDDING_MODEL)
         
         stats = vectorstore.get_collection_stats()
         
@@ -66,11 +65,7 @@ def test_sharepoint_documents_exist():
     print("=" * 70)
     
     try:
-        embeddings = OpenAIEmbeddings()
-        vectorstore = MongoDBVectorStore(
-            collection_name=MONGODB_VECTORSTORE_COLLECTION,
-            embedding_function=embeddings
-        )
+        vectorstore = get_vectorstore(model=EMBEDDING_MODEL)
         
         # Query for SharePoint documents
         filter_query = {"metadata.source_type": "sharepoint_document"}
@@ -84,7 +79,7 @@ def test_sharepoint_documents_exist():
             return False
         
         # Get a sample document to check metadata
-        sample_doc = vectorstore.collection.find_one(filter_query)
+        sample_doc = vectorstore.collection.find_one(filter_query, {"metadata": 1})
         
         if sample_doc:
             metadata = sample_doc.get('metadata', {})
@@ -118,11 +113,7 @@ def test_document_retrieval():
     print("=" * 70)
     
     try:
-        embeddings = OpenAIEmbeddings()
-        vectorstore = MongoDBVectorStore(
-            collection_name=MONGODB_VECTORSTORE_COLLECTION,
-            embedding_function=embeddings
-        )
+        vectorstore = get_vectorstore(model=EMBEDDING_MODEL)
         
         # Test queries
         test_queries = [
@@ -133,10 +124,13 @@ def test_document_retrieval():
         
         print("[*] Testing similarity search...")
         
-        for query in test_queries:
+        # Embed every query in one API call instead of one per search
+        query_embeddings = vectorstore.embeddings.embed_documents(test_queries)
+        
+        for query, query_embedding in zip(test_queries, query_embeddings):
             print(f"\n[*] Query: '{query}'")
             
-            results = vectorstore.similarity_search(query, k=3)
+            results = vectorstore.similarity_search_by_vector(query_embedding, k=3)
             
             if results:
                 print(f"[OK] Found {len(results)} relevant documents")
@@ -165,11 +159,7 @@ def test_citation_format():
     print("=" * 70)
     
     try:
-        embeddings = OpenAIEmbeddings()
-        vectorstore = MongoDBVectorStore(
-            collection_name=MONGODB_VECTORSTORE_COLLECTION,
-            embedding_function=embeddings
-        )
+        vectorstore = get_vectorstore(model=EMBEDDING_MODEL)
         
         # Get a few documents
         docs = vectorstore.similarity_search("migration", k=5)
@@ -273,30 +263,26 @@ def test_file_types_coverage():
     print("=" * 70)
     
     try:
-        embeddings = OpenAIEmbeddings()
-        vectorstore = MongoDBVectorStore(
-            collection_name=MONGODB_VECTORSTORE_COLLECTION,
-            embedding_function=embeddings
-        )
+        vectorstore = get_vectorstore(model=EMBEDDING_MODEL)
         
         # Count documents by file type
         file_types = ['pdf', 'docx', 'doc', 'xlsx', 'xls', 'pptx', 'ppt', 'txt', 'md']
         
         print("[*] Checking file type coverage...\n")
         
-        type_counts = {}
-        for file_type in file_types:
-            filter_query = {
+        # One grouped query instead of a count per file type
+        pipeline = [
+            {"$match": {
                 "metadata.source_type": "sharepoint_document",
-                "metadata.file_type": file_type
-            }
-            count = vectorstore.collection.count_documents(filter_query)
-            if count > 0:
-                type_counts[file_type] = count
+                "metadata.file_type": {"$in": file_types}
+            }},
+            {"$group": {"_id": "$metadata.file_type", "count": {"$sum": 1}}}
+        ]
+        type_counts = Counter({row["_id"]: row["count"] for row in vectorstore.collection.aggregate(pipeline)})
         
         if type_counts:
             print("[OK] File types found in vector store:")
-            for file_type, count in sorted(type_counts.items(), key=lambda x: x[1], reverse=True):
+            for file_type, count in type_counts.most_common():
                 print(f"    {file_type.upper()}: {count} documents")
             
             return True
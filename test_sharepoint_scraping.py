@@ -5,6 +5,7 @@ Test SharePoint Web Scraping
 
 from dotenv import load_dotenv
 import os
+from collections import Counter
 
 load_dotenv()
 
@@ -38,13 +39,11 @@ def test_sharepoint_scraping():
             print(f"\n✅ Extracted {len(documents)} documents")
             
             # Show document types
-            faq_count = sum(1 for d in documents if d.metadata.get('content_type') == 'faq')
-            table_count = sum(1 for d in documents if d.metadata.get('content_type') == 'table')
-            text_count = sum(1 for d in documents if d.metadata.get('content_type') == 'text')
+            content_types = Counter(d.metadata.get('content_type') for d in documents)
             
-            print(f"   FAQs: {faq_count}")
-            print(f"   Tables: {table_count}")
-            print(f"   Text blocks: {text_count}")
+            print(f"   FAQs: {content_types['faq']}")
+            print(f"   Tables: {content_types['table']}")
+            print(f"   Text blocks: {content_types['text']}")
             
             # Show first few documents
             print(f"\n📄 Sample documents:")
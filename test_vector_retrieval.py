@@ -7,15 +7,10 @@ This script:
 """
 import requests
 import json
-from langchain_openai import OpenAIEmbeddings
-from app.mongodb_vectorstore import MongoDBVectorStore
-from config import MONGODB_VECTORSTORE_COLLECTION
-from dotenv import load_dotenv
-import os
+import functools
+from check_common import get_vectorstore
 import time
 
-load_dotenv()
-
 # Test questions
 TEST_QUESTIONS = [
     "What features are supported for Box to OneDrive for Business migration?",
@@ -24,6 +19,15 @@ TEST_QUESTIONS = [
     "What is the purpose of CloudFuze?",
 ]
 
+@functools.lru_cache(maxsize=256)
+def significant_words(text):
+    """Lowercased words longer than 5 characters, memoized per text.
+
+    The same chunks come back for several test questions, so each chunk is
+    lowercased and split once per run rather than once per question.
+    """
+    return frozenset(w for w in text.lower().split() if len(w) > 5)
+
 def get_vector_retrieval(query, k=5):
     """Retrieve documents from vector store for a query."""
     print(f"\n{'='*80}")
@@ -33,16 +37,8 @@ def get_vector_retrieval(query, k=5):
     print(f"{'='*80}\n")
     
     try:
-        # Initialize embeddings and vectorstore
-        embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small",
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
-        
-        vectorstore = MongoDBVectorStore(
-            collection_name=MONGODB_VECTORSTORE_COLLECTION,
-            embedding_function=embeddings
-        )
+        # Shared embeddings and vectorstore (opened once for all questions)
+        vectorstore = get_vectorstore()
         
         # Retrieve documents
         print(f"📚 Retrieving top {k} documents from vector store...")
@@ -131,15 +127,14 @@ def verify_vector_usage(retrieved_docs, answer):
         return False
     
     # Check for common keywords/phrases between retrieved docs and answer
-    answer_lower = answer.lower()
     matches_found = 0
     
+    # Significant answer words (5+ characters) don't depend on the document
+    answer_words = significant_words(answer)
+    
     for doc in retrieved_docs:
-        content_lower = doc['content'].lower()
-        
         # Find common significant words (5+ characters)
-        content_words = set([w for w in content_lower.split() if len(w) > 5])
-        answer_words = set([w for w in answer_lower.split() if len(w) > 5])
+        content_words = significant_words(doc['content'])
         
         common_words = content_words.intersection(answer_words)
         
@@ -12,6 +12,9 @@ if sys.platform == 'win32':
 
 load_dotenv()
 
+# CR/LF -> spaces, so result previews stay on one line
+PREVIEW_FLATTEN = str.maketrans("\r\n", "  ")
+
 print("=" * 70)
 print("MONGODB VECTOR STORE VERIFICATION")
 print("=" * 70)
@@ -52,16 +55,20 @@ try:
     print(f"    ✓ Collection: {MONGODB_VECTORSTORE_COLLECTION}")
     print(f"    ✓ Total documents: {doc_count:,}")
     
-    # Get a sample document
-    sample = collection.find_one()
+    # Get a sample document (field checks, dimension and preview only - not the full vector)
+    sample = collection.find_one({}, {
+        "has_text": {"$ne": [{"$type": "$text"}, "missing"]},
+        "has_embedding": {"$isArray": "$embedding"},
+        "embedding_dim": {"$size": {"$ifNull": ["$embedding", []]}},
+        "text_preview": {"$substrCP": [{"$ifNull": ["$text", ""]}, 0, 80]},
+    })
     if sample:
         print(f"    ✓ Sample document found:")
-        print(f"      - Has 'text' field: {'text' in sample}")
-        print(f"      - Has 'embedding' field: {'embedding' in sample}")
-        print(f"      - Embedding dimension: {len(sample.get('embedding', []))}")
-        if 'text' in sample:
-            text_preview = sample['text'][:80]
-            print(f"      - Text preview: {text_preview}...")
+        print(f"      - Has 'text' field: {sample['has_text']}")
+        print(f"      - Has 'embedding' field: {sample['has_embedding']}")
+        print(f"      - Embedding dimension: {sample['embedding_dim']}")
+        if sample['has_text']:
+            print(f"      - Text preview: {sample['text_preview']}...")
     
     client.close()
 except Exception as e:
@@ -74,16 +81,18 @@ try:
     from app.vectorstore import vectorstore, retriever
     
     if vectorstore:
+        # app.vectorstore exposes a lazy proxy; inspect the real store behind it
+        store_type = type(vectorstore.resolve()).__name__
         print(f"    ✅ Vectorstore loaded successfully")
-        print(f"    ✓ Type: {type(vectorstore).__name__}")
+        print(f"    ✓ Type: {store_type}")
         
         # Check if it's MongoDB or Chroma
-        if "MongoDB" in type(vectorstore).__name__:
+        if "MongoDB" in store_type:
             print(f"    ✅ CONFIRMED: Using MongoDBVectorStore class!")
-        elif "Chroma" in type(vectorstore).__name__:
+        elif "Chroma" in store_type:
             print(f"    ❌ WARNING: Using ChromaDB, not MongoDB!")
         else:
-            print(f"    ⚠️  Unknown vectorstore type: {type(vectorstore).__name__}")
+            print(f"    ⚠️  Unknown vectorstore type: {store_type}")
         
         # Get stats
         if hasattr(vectorstore, 'get_collection_stats'):
@@ -126,7 +135,7 @@ try:
         print(f"    ✅ Found {len(results)} relevant documents!")
         print(f"\n    📄 Top Results:")
         for i, doc in enumerate(results, 1):
-            text_preview = doc.page_content[:100].replace('\n', ' ')
+            text_preview = doc.page_content[:100].translate(PREVIEW_FLATTEN)
             source = doc.metadata.get('source', 'unknown')
             score = doc.metadata.get('score', 'N/A')
             print(f"      {i}. Source: {source}")